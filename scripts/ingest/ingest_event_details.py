@@ -4,18 +4,35 @@ from __future__ import annotations
 import argparse
 import csv
 import sys
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
 
-from ufcstats.net import fetch_html, normalize_ufcstats_url, pick_base_url
-from ufcstats.parse_event_details import parse_event_details
+from ufcstats.net import (
+    DEFAULT_CACHE_DIR,
+    RateLimiter,
+    build_session,
+    drop_cached,
+    fetch_html_cached,
+    normalize_ufcstats_url,
+    pick_base_url,
+)
+from ufcstats.parse_event_details import EventFight, parse_event_details
 from ufcstats.snapshot import default_snapshot_utc, infer_snapshot_from_path
 
 RAW_BASENAME = "event_details__ufcstats__{snapshot}.csv"
 
+# Stable schema for the raw snapshot (mirror of event-details table):
+# event context, then the parser's EventFight fields in order.
+EVENT_FIELDS = ["snapshot", "event_url", "event_name", "event_date_raw", "event_location_raw"]
+FIELDNAMES = [*EVENT_FIELDS, *EventFight._fields]
+
+# Rows are streamed to disk; flush periodically so a crash loses little work.
+FLUSH_EVERY = 100
+
 
 def read_event_directory_csv(path: Path) -> List[Dict[str, str]]:
     """
@@ -40,12 +57,64 @@ def ensure_outdir(outdir: Path) -> None:
     outdir.mkdir(parents=True, exist_ok=True)
 
 
-def write_csv(path: Path, rows: List[Dict[str, str]], fieldnames: List[str]) -> None:
-    with path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        w.writeheader()
-        for row in rows:
-            w.writerow(row)
+def _scrape_one(
+    i: int,
+    n: int,
+    ev: Dict[str, str],
+    session: requests.Session,
+    base_url: str,
+    snap: str,
+    limiter: RateLimiter,
+    timeout: int,
+    retries: int,
+    cache_dir: Optional[Path],
+    refresh: bool,
+) -> Optional[Tuple[str, str, Tuple[str, ...], List[EventFight]]]:
+    """
+    Fetch + parse one event-details page (runs in a worker thread).
+
+    Returns (event_url, event_label, event_ctx, fights), where event_ctx holds
+    the EVENT_FIELDS values shared by every fight row, or None if the event
+    failed (already reported on stderr).
+    """
+    raw_event_url = (ev.get("event_url") or "").strip()
+    event_url = normalize_ufcstats_url(raw_event_url, base_url)
+
+    try:
+        html = fetch_html_cached(
+            session,
+            event_url,
+            cache_dir=cache_dir,
+            timeout=timeout,
+            retries=retries,
+            refresh=refresh,
+            limiter=limiter,
+        )
+    except Exception as e:
+        print(f"[{i}/{n}] FAIL fetch {event_url}: {e}", file=sys.stderr)
+        return None
+
+    try:
+        event_meta, fights = parse_event_details(html, base_url=base_url)
+    except Exception as e:
+        print(f"[{i}/{n}] FAIL parse {event_url}: {e}", file=sys.stderr)
+        return None
+
+    if cache_dir is not None and not any(br.method_raw.strip() for br in fights):
+        # No results posted yet (upcoming event): don't let the cache freeze this page.
+        drop_cached(cache_dir, event_url)
+
+    # Event context, prepended to each fight row at write time
+    event_ctx = (
+        snap,
+        event_url,
+        (event_meta.get("event_name") or ev.get("event_name") or "").strip(),
+        (event_meta.get("event_date_raw") or ev.get("event_date_raw") or "").strip(),
+        (event_meta.get("event_location_raw") or ev.get("event_location_raw") or "").strip(),
+    )
+
+    event_label = (event_meta.get("event_name") or ev.get("event_name") or "event").strip()
+    return event_url, event_label, event_ctx, fights
 
 
 def ingest_event_details(
@@ -56,11 +125,24 @@ def ingest_event_details(
     limit: int | None,
     timeout: int,
     retries: int,
+    workers: int = 8,
+    cache_dir: Optional[Path] = None,
+    refresh: bool = False,
+    session: Optional[requests.Session] = None,
 ) -> Path:
     """
     Reads an event directory snapshot and scrapes each event-details page into a raw event_details snapshot.
 
     Output is ONE ROW PER fight, mirroring the event-details table.
+
+    Pages are fetched by `workers` threads sharing one pooled Session; `sleep_s`
+    is the minimum spacing between request starts across all workers.
+    If `cache_dir` is set, event HTML is read from / written to that cache
+    (completed events never change; pages without results yet are evicted
+    again); `refresh=True` revalidates every cached page with a conditional
+    GET instead of trusting it.
+    Rows are written as each event completes; only the dedup keys stay in memory.
+    Pass `session` to reuse an existing connection pool (e.g. from the pipeline runner).
     """
     inferred = infer_snapshot_from_path(str(input_event_directory))
     snap = snapshot or inferred or default_snapshot_utc()
@@ -75,86 +157,59 @@ def ingest_event_details(
     if not event_rows:
         raise RuntimeError("No event rows found in event directory CSV (missing event_url?).")
 
-    session = requests.Session()
+    session = session or build_session(pool_size=workers)
     base_url = pick_base_url(session)
+    limiter = RateLimiter(sleep_s)
 
-    all_fights: List[Dict[str, str]] = []
     seen_keys: Set[str] = set()
+    written = 0
 
     n = len(event_rows)
-    for i, ev in enumerate(event_rows, start=1):
-        raw_event_url = (ev.get("event_url") or "").strip()
-        event_url = normalize_ufcstats_url(raw_event_url, base_url)
-
-        try:
-            html = fetch_html(session, event_url, timeout=timeout, retries=retries)
-        except Exception as e:
-            print(f"[{i}/{n}] FAIL fetch {event_url}: {e}", file=sys.stderr)
-            continue
-
-        try:
-            event_meta, fights = parse_event_details(html, base_url=base_url)
-        except Exception as e:
-            print(f"[{i}/{n}] FAIL parse {event_url}: {e}", file=sys.stderr)
-            continue
-
-        # Inject event context onto each fight row
-        for br in fights:
-            br["snapshot"] = snap
-            br["event_url"] = event_url
-            br["event_name"] = (event_meta.get("event_name") or ev.get("event_name") or "").strip()
-            br["event_date_raw"] = (event_meta.get("event_date_raw") or ev.get("event_date_raw") or "").strip()
-            br["event_location_raw"] = (event_meta.get("event_location_raw") or ev.get("event_location_raw") or "").strip()
-
-            # Dedup key: prefer fight_url if present; else event_url + fight_order
-            fight_url = (br.get("fight_url") or "").strip()
-            fight_order = (br.get("fight_order") or "").strip()
-            key = fight_url if fight_url else f"{event_url}__{fight_order}"
-
-            if not key or key in seen_keys:
-                continue
-            seen_keys.add(key)
-            all_fights.append(br)
-
-        event_label = (event_meta.get("event_name") or ev.get("event_name") or "event").strip()
-        print(f"[{i}/{n}] {event_label} -> fights: {len(fights)}")
-
-        if sleep_s > 0:
-            time.sleep(sleep_s)
-
-    if not all_fights:
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        with outpath.open("w", encoding="utf-8", newline="") as f:
+            # Positional writer: rows are event_ctx + EventFight tuples in FIELDNAMES order.
+            w = csv.writer(f)
+            w.writerow(FIELDNAMES)
+
+            futures = deque(
+                ex.submit(
+                    _scrape_one, i, n, ev, session, base_url, snap, limiter, timeout, retries, cache_dir, refresh
+                )
+                for i, ev in enumerate(event_rows, start=1)
+            )
+            # Drain in submission order so output rows stay deterministic; popping
+            # each future drops our reference to its result once it's written.
+            i = 0
+            while futures:
+                i += 1
+                result = futures.popleft().result()
+                if result is None:
+                    continue
+                event_url, event_label, event_ctx, fights = result
+
+                for br in fights:
+                    # Dedup key: prefer fight_url if present; else event_url + fight_order
+                    fight_url = br.fight_url.strip()
+                    key = fight_url if fight_url else f"{event_url}__{br.fight_order.strip()}"
+
+                    if not key or key in seen_keys:
+                        continue
+                    seen_keys.add(key)
+                    w.writerow(event_ctx + br)
+                    written += 1
+                    if written % FLUSH_EVERY == 0:
+                        f.flush()
+
+                print(f"[{i}/{n}] {event_label} -> fights: {len(fights)}")
+    finally:
+        # On error / Ctrl-C, drop queued fetches instead of draining them all.
+        ex.shutdown(cancel_futures=True)
+
+    if not written:
+        outpath.unlink(missing_ok=True)  # don't leave a header-only snapshot behind
         raise RuntimeError("No fights parsed. Check site reachability and parser selectors.")
 
-    # Stable schema for the raw snapshot (mirror of event-details table)
-    fieldnames = [
-        "snapshot",
-        "event_url",
-        "event_name",
-        "event_date_raw",
-        "event_location_raw",
-        "fight_url",
-        "fight_order",
-        "fighter_1_name",
-        "fighter_1_url",
-        "fighter_1_result",
-        "fighter_2_name",
-        "fighter_2_url",
-        "fighter_2_result",
-        "kd_1",
-        "str_1",
-        "td_1",
-        "sub_1",
-        "kd_2",
-        "str_2",
-        "td_2",
-        "sub_2",
-        "weight_class_raw",
-        "method_raw",
-        "round_raw",
-        "time_raw",
-    ]
-
-    write_csv(outpath, all_fights, fieldnames=fieldnames)
     return outpath
 
 
@@ -181,7 +236,7 @@ def build_argparser() -> argparse.ArgumentParser:
         "--sleep",
         type=float,
         default=0.35,
-        help="Seconds to sleep between requests (default: 0.35)",
+        help="Minimum seconds between request starts, across all workers (default: 0.35)",
     )
     p.add_argument(
         "--limit",
@@ -191,6 +246,22 @@ def build_argparser() -> argparse.ArgumentParser:
     )
     p.add_argument("--timeout", type=int, default=30)
     p.add_argument("--retries", type=int, default=3)
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent fetch threads (default: 8). Request rate is still bounded by --sleep.",
+    )
+    p.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help="On-disk HTML cache for event pages (default: data/cache/html). Pass '' to disable.",
+    )
+    p.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate cached event pages with the server (conditional GET; unchanged pages are not re-downloaded).",
+    )
     return p
 
 
@@ -205,6 +276,9 @@ def main() -> int:
         limit=args.limit,
         timeout=int(args.timeout),
         retries=int(args.retries),
+        workers=int(args.workers),
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        refresh=args.refresh,
     )
     print(f"\nWrote: {outpath}")
     return 0
@@ -8,8 +8,8 @@ from typing import Optional, Tuple
 import pandas as pd
 import requests
 
-from ufcstats.net import fetch_html, pick_base_url, normalize_ufcstats_url
-from ufcstats.parse_event_directory import parse_event_directory
+from ufcstats.net import build_session, fetch_html, pick_base_url, normalize_ufcstats_url
+from ufcstats.parse_event_directory import EVENT_DIRECTORY_COLUMNS, parse_event_directory_columns
 from ufcstats.snapshot import default_snapshot_utc
 
 
@@ -43,32 +43,29 @@ def ingest_event_directory(
     out_path: Path,
     timeout: int = 30,
     retries: int = 3,
+    session: Optional[requests.Session] = None,
 ) -> Tuple[Path, int]:
     """
     Fetch UFCStats completed events directory and write a raw snapshot CSV.
+    Pass `session` to reuse an existing connection pool (e.g. from the pipeline runner).
 
     Returns: (written_path, n_rows)
     """
-    session = requests.Session()
+    session = session or build_session(pool_size=1)
     base_url = pick_base_url(session)
 
     events_url = _resolve_events_url(base_url)
 
     html = fetch_html(session, events_url, timeout=timeout, retries=retries)
 
-    rows = parse_event_directory(html, base_url=base_url)
-    if not rows:
+    # Columnar parse: one list per column straight into the DataFrame (no dict per event).
+    cols = parse_event_directory_columns(html, base_url=base_url)
+    if not cols["event_url"]:
         raise RuntimeError(
             "Parsed 0 events. UFCStats layout may have changed, or request returned unexpected HTML."
         )
 
-    df = pd.DataFrame(rows)
-
-    # Minimal sanity: enforce expected columns
-    expected_cols = ["event_url", "event_name", "event_date_raw", "event_location_raw"]
-    missing = [c for c in expected_cols if c not in df.columns]
-    if missing:
-        raise RuntimeError(f"Parser output missing expected columns: {missing}. Got: {list(df.columns)}")
+    df = pd.DataFrame(cols, columns=list(EVENT_DIRECTORY_COLUMNS))
 
     # De-dupe conservatively by event_url
     df = df.drop_duplicates(subset=["event_url"]).reset_index(drop=True)
@@ -3,20 +3,37 @@ from __future__ import annotations
 
 import argparse
 import csv
+import shutil
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
 
-from ufcstats.net import fetch_html, normalize_ufcstats_url, pick_base_url
+from ufcstats.net import (
+    DEFAULT_CACHE_DIR,
+    RateLimiter,
+    build_session,
+    fetch_html_cached,
+    normalize_ufcstats_url,
+    pick_base_url,
+)
+from ufcstats import parse_fighter_details as _parser
 from ufcstats.parse_fighter_details import parse_fighter_details
-from ufcstats.snapshot import default_snapshot_utc, infer_snapshot_from_path
+from ufcstats.snapshot import DATE_RE, ParseMemo, default_snapshot_utc, infer_snapshot_from_path, page_fingerprint
 
 
 RAW_BASENAME = "fighter_details__ufcstats__{snapshot}.csv"
 
+# Keys copied (stripped) from parse_fighter_details() output, in column order.
+_PARSED_FIELDS = ("dob_raw", "slpm", "str_acc", "sapm", "str_def", "td_avg", "td_acc", "td_def", "sub_avg")
+
+FIELDNAMES = ["snapshot", "fighter_url", "first_name", "last_name", *_PARSED_FIELDS]
+
+# Per-snapshot fighter page caches kept on disk (newest first, current included).
+DEFAULT_KEEP_SNAPSHOTS = 2
+
 
 def read_fighter_directory_csv(path: Path) -> List[Dict[str, str]]:
     """
@@ -45,11 +62,81 @@ def ensure_outdir(outdir: Path) -> None:
 
 
 def write_csv(path: Path, rows: List[Dict[str, str]], fieldnames: List[str]) -> None:
+    # Positional rows + one writerows() call; DictWriter re-checks keys per row.
+    # Missing keys write "" and extra keys are dropped, same as DictWriter(extrasaction="ignore").
     with path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        w.writeheader()
-        for row in rows:
-            w.writerow(row)
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        w.writerows([row.get(k, "") for k in fieldnames] for row in rows)
+
+
+def prune_snapshot_caches(snapshots_dir: Path, keep: int, current: Optional[str] = None) -> List[Path]:
+    """
+    Delete all but the newest `keep` <snapshot> directories under `snapshots_dir`
+    (e.g. data/cache/html/fighter-details). Only YYYY-MM-DD-named directories
+    are touched, and `current` (the snapshot just written, even when backfilling
+    an older one) is never removed; keep <= 0 keeps everything.
+    Returns the removed paths.
+    """
+    if keep <= 0 or not snapshots_dir.is_dir():
+        return []
+    snaps = sorted(
+        (d for d in snapshots_dir.iterdir() if d.is_dir() and DATE_RE.fullmatch(d.name)),
+        key=lambda d: d.name,
+        reverse=True,
+    )
+    removed = [d for d in snaps[keep:] if d.name != current]
+    for d in removed:
+        shutil.rmtree(d, ignore_errors=True)
+    return removed
+
+
+def _fetch_and_parse(
+    i: int,
+    n: int,
+    session: requests.Session,
+    fighter_url: str,
+    limiter: RateLimiter,
+    timeout: int,
+    retries: int,
+    cache_dir: Optional[Path],
+    refresh: bool,
+    memo: Optional[ParseMemo] = None,
+) -> Optional[Dict[str, str]]:
+    """
+    Fetch + parse one fighter page (runs in a worker thread).
+    A page identical to the one seen last time reuses that parse from `memo`.
+    Returns None on failure (already reported on stderr).
+    """
+    try:
+        html = fetch_html_cached(
+            session,
+            fighter_url,
+            cache_dir=cache_dir,
+            timeout=timeout,
+            retries=retries,
+            refresh=refresh,
+            limiter=limiter,
+        )
+    except Exception as e:
+        print(f"[{i}/{n}] FAIL fetch {fighter_url}: {e}", file=sys.stderr)
+        return None
+
+    fingerprint = page_fingerprint(html.encode("utf-8")) if memo is not None else ""
+    if memo is not None:
+        hit = memo.lookup(fighter_url, fingerprint)
+        if hit is not None:
+            return hit
+
+    try:
+        parsed = parse_fighter_details(html)  # dict: dob_raw + stats only
+    except Exception as e:
+        print(f"[{i}/{n}] FAIL parse {fighter_url}: {e}", file=sys.stderr)
+        return None
+
+    if memo is not None:
+        memo.store(fighter_url, fingerprint, parsed)
+    return parsed
 
 
 def ingest_fighter_details(
@@ -60,6 +147,11 @@ def ingest_fighter_details(
     limit: int | None,
     timeout: int,
     retries: int,
+    workers: int = 8,
+    session: Optional[requests.Session] = None,
+    cache_dir: Optional[Path] = None,
+    refresh: bool = False,
+    keep_snapshots: int = DEFAULT_KEEP_SNAPSHOTS,
 ) -> Path:
     """
     Reads fighter_directory snapshot, fetches each fighter-details page,
@@ -67,6 +159,18 @@ def ingest_fighter_details(
       - snapshot, fighter_url
       - first_name, last_name (debug)
       - dob_raw + career stats
+
+    Pages are fetched by `workers` threads; `sleep_s` is the minimum spacing
+    between request starts across all of them. Pass `session` to reuse an
+    existing connection pool (e.g. from the pipeline runner).
+
+    If `cache_dir` is set, pages are cached under `cache_dir/fighter-details/<snapshot>`:
+    career stats change between snapshots, so a new snapshot always refetches,
+    while re-running the same snapshot (e.g. after a parser fix) skips the network.
+    Each snapshot adds a full copy of every fighter page, so after a successful run
+    only the newest `keep_snapshots` snapshot caches are kept (0 keeps all).
+    Parsed rows are also memoized in `cache_dir/parsed/fighter-details.json`, keyed
+    by page fingerprint, so a refetched page that hasn't changed isn't re-parsed.
     """
     inferred = infer_snapshot_from_path(str(input_fighter_directory))
     snap = snapshot or inferred or default_snapshot_utc()
@@ -81,12 +185,17 @@ def ingest_fighter_details(
     if not base_rows:
         raise RuntimeError("No fighters found in fighter directory CSV (missing fighter_url/profile_url?).")
 
-    session = requests.Session()
+    session = session or build_session(pool_size=workers)
     base_url = pick_base_url(session)
+    limiter = RateLimiter(sleep_s)
+    page_cache = Path(cache_dir) / "fighter-details" / snap if cache_dir is not None else None
+    memo = ParseMemo(Path(cache_dir) / "parsed" / "fighter-details.json", _parser.__file__) if cache_dir is not None else None
 
     out_rows: List[Dict[str, str]] = []
     seen: Set[str] = set()
 
+    # Normalize + de-dupe up front; (position in input, directory row, url)
+    jobs: List[Tuple[int, Dict[str, str], str]] = []
     n = len(base_rows)
     for i, r in enumerate(base_rows, start=1):
         raw_url = (r.get("fighter_url") or r.get("profile_url") or "").strip()
@@ -98,61 +207,44 @@ def ingest_fighter_details(
         if fighter_url in seen:
             continue
         seen.add(fighter_url)
+        jobs.append((i, r, fighter_url))
+
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = [
+            ex.submit(_fetch_and_parse, i, n, session, fighter_url, limiter, timeout, retries, page_cache, refresh, memo)
+            for i, _, fighter_url in jobs
+        ]
+        # Drain in submission order so output rows keep directory order.
+        for (i, r, fighter_url), fut in zip(jobs, futures):
+            parsed = fut.result()
+            if parsed is None:
+                continue
 
-        try:
-            html = fetch_html(session, fighter_url, timeout=timeout, retries=retries)
-        except Exception as e:
-            print(f"[{i}/{n}] FAIL fetch {fighter_url}: {e}", file=sys.stderr)
-            continue
-
-        try:
-            parsed = parse_fighter_details(html)  # dict: dob_raw + stats only
-        except Exception as e:
-            print(f"[{i}/{n}] FAIL parse {fighter_url}: {e}", file=sys.stderr)
-            continue
-
-        out_row = {
-            "snapshot": snap,
-            "fighter_url": fighter_url,
-            "first_name": (r.get("first_name") or "").strip(),
-            "last_name": (r.get("last_name") or "").strip(),
-            "dob_raw": (parsed.get("dob_raw") or "").strip(),
-            "slpm": (parsed.get("slpm") or "").strip(),
-            "str_acc": (parsed.get("str_acc") or "").strip(),
-            "sapm": (parsed.get("sapm") or "").strip(),
-            "str_def": (parsed.get("str_def") or "").strip(),
-            "td_avg": (parsed.get("td_avg") or "").strip(),
-            "td_acc": (parsed.get("td_acc") or "").strip(),
-            "td_def": (parsed.get("td_def") or "").strip(),
-            "sub_avg": (parsed.get("sub_avg") or "").strip(),
-        }
-
-        out_rows.append(out_row)
-        print(f"[{i}/{n}] fighter_details: {fighter_url}")
-
-        if sleep_s > 0:
-            time.sleep(sleep_s)
+            out_row = {
+                "snapshot": snap,
+                "fighter_url": fighter_url,
+                "first_name": (r.get("first_name") or "").strip(),
+                "last_name": (r.get("last_name") or "").strip(),
+            }
+            out_row.update({k: (parsed.get(k) or "").strip() for k in _PARSED_FIELDS})
+
+            out_rows.append(out_row)
+            print(f"[{i}/{n}] fighter_details: {fighter_url}")
+    finally:
+        # On error / Ctrl-C, drop queued fetches instead of draining them all.
+        ex.shutdown(cancel_futures=True)
+        if memo is not None:
+            memo.save()
 
     if not out_rows:
         raise RuntimeError("No fighter details parsed. Check reachability / selectors.")
 
-    fieldnames = [
-        "snapshot",
-        "fighter_url",
-        "first_name",
-        "last_name",
-        "dob_raw",
-        "slpm",
-        "str_acc",
-        "sapm",
-        "str_def",
-        "td_avg",
-        "td_acc",
-        "td_def",
-        "sub_avg",
-    ]
-
-    write_csv(outpath, out_rows, fieldnames)
+    write_csv(outpath, out_rows, FIELDNAMES)
+
+    if page_cache is not None:
+        for d in prune_snapshot_caches(page_cache.parent, keep_snapshots, current=snap):
+            print(f"Pruned fighter page cache: {d}")
     return outpath
 
 
@@ -163,10 +255,14 @@ def build_argparser() -> argparse.ArgumentParser:
     p.add_argument("--input", required=True, help="Path to data/raw/fighter_directory__ufcstats__YYYY-MM-DD.csv")
     p.add_argument("--outdir", default="data/raw", help="Output directory (default: data/raw)")
     p.add_argument("--snapshot", default=None, help="Snapshot YYYY-MM-DD (default inferred from input, else UTC today)")
-    p.add_argument("--sleep", type=float, default=0.35, help="Seconds to sleep between requests (default: 0.35)")
+    p.add_argument("--sleep", type=float, default=0.35, help="Minimum seconds between request starts, across all workers (default: 0.35)")
     p.add_argument("--limit", type=int, default=None, help="Optional cap for testing")
     p.add_argument("--timeout", type=int, default=30)
     p.add_argument("--retries", type=int, default=3)
+    p.add_argument("--workers", type=int, default=8, help="Concurrent fetch threads (default: 8)")
+    p.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="On-disk HTML cache, per snapshot for fighter pages (default: data/cache/html). Pass '' to disable.")
+    p.add_argument("--refresh", action="store_true", help="Revalidate cached fighter pages with the server (conditional GET).")
+    p.add_argument("--keep-snapshots", type=int, default=DEFAULT_KEEP_SNAPSHOTS, help=f"Per-snapshot fighter page caches to keep, newest first (default: {DEFAULT_KEEP_SNAPSHOTS}; 0 keeps all).")
     return p
 
 
@@ -180,6 +276,10 @@ def main() -> int:
         limit=args.limit,
         timeout=int(args.timeout),
         retries=int(args.retries),
+        workers=int(args.workers),
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        refresh=args.refresh,
+        keep_snapshots=args.keep_snapshots,
     )
     print(f"\nWrote: {outpath}")
     return 0
@@ -2,13 +2,14 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import requests
 
-from ufcstats.net import fetch_html, pick_base_url
+from ufcstats.net import build_session, fetch_html, pick_base_url
 from ufcstats.parse_fighter_directory import parse_fighter_directory
 from ufcstats.snapshot import default_snapshot_utc
 
@@ -32,12 +33,26 @@ def _ensure_parent_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+def _fetch_char(
+    session: requests.Session,
+    base_url: str,
+    char: str,
+    timeout: int,
+    retries: int,
+) -> List[Dict[str, str]]:
+    url = f"{base_url}{FIGHTERS_PATH_TMPL.format(char=char)}"
+    html = fetch_html(session, url, timeout=timeout, retries=retries)
+    return parse_fighter_directory(html, base_url=base_url)
+
+
 def ingest_fighter_directory(
     snapshot: str,
     out_path: Path,
     chars: List[str] | None = None,
     timeout: int = 30,
     retries: int = 3,
+    workers: int = 8,
+    session: Optional[requests.Session] = None,
 ) -> Tuple[Path, int]:
     """
     Fetch UFCStats fighters directory for each char and write a combined raw snapshot CSV.
@@ -46,19 +61,24 @@ def ingest_fighter_directory(
       snapshot, char,
       fighter_url, fighter_name, first_name, last_name, nickname_raw,
       height_raw, weight_raw, reach_raw, stance_raw, w_raw, l_raw, d_raw, belt_raw
+
+    Pass `session` to reuse an existing connection pool (e.g. from the pipeline runner).
     """
     chars = chars or DEFAULT_CHARS
 
-    session = requests.Session()
+    session = session or build_session(pool_size=workers)
     base_url = pick_base_url(session)
 
     all_rows: List[Dict[str, str]] = []
 
-    for c in chars:
-        url = f"{base_url}{FIGHTERS_PATH_TMPL.format(char=c)}"
-        html = fetch_html(session, url, timeout=timeout, retries=retries)
+    # The char pages are independent: fetch them concurrently. map() yields
+    # in input order, so rows are appended in char order as before.
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        per_char = list(
+            ex.map(lambda c: _fetch_char(session, base_url, c, timeout, retries), chars)
+        )
 
-        rows = parse_fighter_directory(html, base_url=base_url)
+    for c, rows in zip(chars, per_char):
         if not rows:
             # Not fatal: some letters may be empty depending on UFCStats behavior.
             continue
@@ -115,6 +135,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     p.add_argument("--chars", default=None, help='Optional override, e.g. "ABC" or "A,B,C". Default A-Z.')
     p.add_argument("--timeout", type=int, default=30)
     p.add_argument("--retries", type=int, default=3)
+    p.add_argument("--workers", type=int, default=8, help="Concurrent char-page fetches (default: 8).")
 
     args = p.parse_args(argv)
 
@@ -134,6 +155,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         chars=chars,
         timeout=args.timeout,
         retries=args.retries,
+        workers=args.workers,
     )
 
     print(f"Wrote {n:,} fighters → {written}")
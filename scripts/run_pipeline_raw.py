@@ -2,22 +2,30 @@
 from __future__ import annotations
 
 import os
-import subprocess
-import sys
 from pathlib import Path
 
+from scripts.ingest.ingest_event_details import ingest_event_details
+from scripts.ingest.ingest_event_directory import ingest_event_directory
+from scripts.ingest.ingest_fight_details import ingest_fight_details
+from scripts.ingest.ingest_fighter_details import ingest_fighter_details
+from scripts.ingest.ingest_fighter_directory import ingest_fighter_directory
+from ufcstats.net import DEFAULT_CACHE_DIR, build_session
 from ufcstats.snapshot import default_snapshot_utc
 
 RAW_DIR = Path("data") / "raw"
 
+# Same defaults as each stage's CLI.
+WORKERS = 8
+TIMEOUT = 30
+RETRIES = 3
+
 
 def _ensure_dirs() -> None:
     RAW_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _run(args: list[str]) -> None:
-    print("\n$ " + " ".join(args))
-    subprocess.run(args, check=True)
+def _stage(name: str) -> None:
+    print(f"\n=== {name} ===")
 
 
 def main() -> int:
@@ -35,68 +43,75 @@ def main() -> int:
     fighter_details_csv = RAW_DIR / f"fighter_details__ufcstats__{snap}.csv"
     fight_details_csv = RAW_DIR / f"fight_details__ufcstats__{snap}.csv"
 
-    py = sys.executable
-
-    # 1) Event directory
-    _run([py, "-m", "scripts.ingest.ingest_event_directory", "--out", str(event_dir_csv)])
-
-    # 2) Fighter directory
-    _run([py, "-m", "scripts.ingest.ingest_fighter_directory", "--out", str(fighter_dir_csv)])
-
-    # 3) Event details (reads event directory)
-    _run(
-        [
-            py,
-            "-m",
-            "scripts.ingest.ingest_event_details",
-            "--input",
-            str(event_dir_csv),
-            "--outdir",
-            str(RAW_DIR),
-            "--snapshot",
-            snap,
-        ]
-    )
-
-    # 4) Fighter details (reads fighter directory)
-    _run(
-        [
-            py,
-            "-m",
-            "scripts.ingest.ingest_fighter_details",
-            "--input",
-            str(fighter_dir_csv),
-            "--outdir",
-            str(RAW_DIR),
-            "--snapshot",
-            snap,
-        ]
-    )
-
-    # 5) Fight details (reads event details; needs fight_url)
-    fight_limit = os.getenv(" ")  # optional
-    args = [
-        py,
-        "-m",
-        "scripts.ingest.ingest_fight_details",
-        "--input",
-        str(event_details_csv),
-        "--outdir",
-        str(RAW_DIR),
-        "--snapshot",
-        snap,
-    ]
-
-    #Optional test mode: UFCPIPE_LIMIT_FIGHTS=25
-    if fight_limit:
-        args += ["--limit", str(int(fight_limit))]
-
-    # Optional resume mode: UFCPIPE_RESUME=1
-    if os.getenv("UFCPIPE_RESUME"):
-        args += ["--resume"]
-
-    _run(args)
-
+    # All stages run in this process and share one pooled Session, so
+    # keep-alive connections carry over from one stage to the next.
+    with build_session(pool_size=WORKERS) as session:
+        # 1) Event directory
+        _stage("event_directory")
+        ingest_event_directory(
+            snapshot=snap, out_path=event_dir_csv, timeout=TIMEOUT, retries=RETRIES, session=session
+        )
+
+        # 2) Fighter directory
+        _stage("fighter_directory")
+        ingest_fighter_directory(
+            snapshot=snap,
+            out_path=fighter_dir_csv,
+            timeout=TIMEOUT,
+            retries=RETRIES,
+            workers=WORKERS,
+            session=session,
+        )
+
+        # 3) Event details (reads event directory)
+        _stage("event_details")
+        ingest_event_details(
+            input_event_directory=event_dir_csv,
+            outdir=RAW_DIR,
+            snapshot=snap,
+            sleep_s=0.35,
+            limit=None,
+            timeout=TIMEOUT,
+            retries=RETRIES,
+            workers=WORKERS,
+            cache_dir=DEFAULT_CACHE_DIR,
+            session=session,
+        )
+
+        # 4) Fighter details (reads fighter directory)
+        _stage("fighter_details")
+        ingest_fighter_details(
+            input_fighter_directory=fighter_dir_csv,
+            outdir=RAW_DIR,
+            snapshot=snap,
+            sleep_s=0.35,
+            limit=None,
+            timeout=TIMEOUT,
+            retries=RETRIES,
+            workers=WORKERS,
+            cache_dir=DEFAULT_CACHE_DIR,
+            session=session,
+        )
+
+        # 5) Fight details (reads event details; needs fight_url)
+        # Optional test mode: UFCPIPE_LIMIT_FIGHTS=25
+        fight_limit = os.getenv("UFCPIPE_LIMIT_FIGHTS")
+
+        _stage("fight_details")
+        ingest_fight_details(
+            input_event_details=event_details_csv,
+            outdir=RAW_DIR,
+            snapshot=snap,
+            sleep_s=0.25,
+            timeout=TIMEOUT,
+            retries=RETRIES,
+            limit=int(fight_limit) if fight_limit else None,
+            # Optional resume mode: UFCPIPE_RESUME=1
+            resume=bool(os.getenv("UFCPIPE_RESUME")),
+            workers=WORKERS,
+            cache_dir=DEFAULT_CACHE_DIR,
+            session=session,
+        )
 
     print("\n=== Raw pipeline complete ===")
     print(f"Wrote: {event_dir_csv}")
@@ -0,0 +1,15 @@
+# tests/_fixtures.py
+import json
+from pathlib import Path
+
+FIXTURES = Path(__file__).with_name("fixtures")
+BASE = "http://ufcstats.com"
+
+
+def read_html(name: str) -> str:
+    return (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+
+
+def read_expected(name: str):
+    """Rows captured from the original BeautifulSoup parsers on the same fixture."""
+    return json.loads((FIXTURES / f"{name}.expected.json").read_text(encoding="utf-8"))
@@ -0,0 +1,92 @@
+# tests/test_ingest_fight_details.py
+import csv
+import tempfile
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest import mock
+
+from ufcstats import ingest_fight_details as ifd
+from ufcstats.parse_fight_details import parse_fight_details
+
+BASE = "http://ufcstats.com"
+SNAP = "2024-01-01"
+URL_A, URL_B, URL_C = (f"{BASE}/fight-details/{k}" for k in ("aaa", "bbb", "ccc"))
+
+
+class LegacyCsvResumeTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.outpath = self.root / ifd.RAW_BASENAME.format(snapshot=SNAP)
+        self.fetched = []
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _fake_fetch(self, session, url, **kwargs):
+        self.fetched.append(url)
+        return "<html><body><p>fight</p></body></html>"
+
+    def _write_input(self, urls):
+        path = self.root / f"event_details__ufcstats__{SNAP}.csv"
+        with path.open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["event_url", "fight_url"])
+            w.writerows([["e", u] for u in urls])
+        return path
+
+    def _run(self, urls, resume):
+        self.fetched.clear()
+        with mock.patch.object(ifd, "fetch_html_cached", self._fake_fetch), mock.patch.object(
+            ifd, "pick_base_url", return_value=BASE
+        ):
+            ifd.ingest_fight_details(
+                self._write_input(urls), self.root, SNAP, sleep_s=0.0, resume=resume, workers=2
+            )
+
+    def test_run_without_resume_seeds_sidecar_from_legacy_csv(self):
+        # A CSV written before the .done sidecar existed: one fight, no sidecar.
+        row = parse_fight_details(html="<html></html>", snapshot=SNAP, fight_url=URL_A)
+        with self.outpath.open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(list(row))
+            w.writerow(list(row.values()))
+        done_path = self.outpath.with_suffix(".done")
+        self.assertFalse(done_path.exists())
+
+        self._run([URL_B], resume=False)
+        self.assertEqual(self.fetched, [URL_B])
+        self.assertEqual(done_path.read_text(encoding="utf-8").splitlines(), [URL_A, URL_B])
+
+        self._run([URL_A, URL_B, URL_C], resume=True)
+        self.assertEqual(self.fetched, [URL_C])
+        self.assertEqual(ifd.read_csv_column(self.outpath, "fight_url"), [URL_A, URL_B, URL_C])
+
+
+class ReadCsvColumnTest(unittest.TestCase):
+    def test_values_are_stripped_and_blanks_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.csv"
+            path.write_text(f"event_url,fight_url\ne, {URL_A} \ne,   \ne\ne,{URL_B}\n", encoding="utf-8")
+            self.assertEqual(ifd.read_csv_column(path, "fight_url"), [URL_A, URL_B])
+
+
+class BrokenParsePoolTest(unittest.TestCase):
+    class _BrokenPool:
+        def submit(self, fn, *args):
+            fut = Future()
+            fut.set_exception(BrokenProcessPool("worker died"))
+            return fut
+
+    def test_broken_pool_is_not_reported_as_parse_failure(self):
+        with mock.patch.object(ifd, "fetch_html_cached", return_value="<html></html>"):
+            with self.assertRaises(BrokenProcessPool):
+                ifd._fetch_and_parse(
+                    None, URL_A, SNAP, None, 30, 0, None, False, parse_pool=self._BrokenPool()
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+# tests/test_ingest_fighter_details.py
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.ingest.ingest_fighter_details import prune_snapshot_caches
+
+
+class PruneSnapshotCachesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for name in ("2024-01-01", "2024-02-01", "2024-03-01", "notes"):
+            (self.root / name).mkdir()
+            (self.root / name / "page.html.gz").write_bytes(b"x")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _left(self):
+        return sorted(p.name for p in self.root.iterdir())
+
+    def test_keeps_newest_and_ignores_non_snapshot_dirs(self):
+        prune_snapshot_caches(self.root, keep=2, current="2024-03-01")
+        self.assertEqual(self._left(), ["2024-02-01", "2024-03-01", "notes"])
+
+    def test_never_removes_current_snapshot(self):
+        prune_snapshot_caches(self.root, keep=1, current="2024-01-01")
+        self.assertEqual(self._left(), ["2024-01-01", "2024-03-01", "notes"])
+
+    def test_zero_keeps_everything(self):
+        self.assertEqual(prune_snapshot_caches(self.root, keep=0), [])
+        self.assertEqual(len(self._left()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
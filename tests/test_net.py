@@ -0,0 +1,58 @@
+# tests/test_net.py
+import http.server
+import threading
+import unittest
+from unittest import mock
+
+from ufcstats import net
+
+
+class _FlakyHandler(http.server.BaseHTTPRequestHandler):
+    """First GET dies mid-body (connection reset after a partial write); later GETs succeed."""
+
+    body = b"<html><body>" + b"x" * 4096 + b"</body></html>"
+    hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).hits += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        if type(self).hits == 1:
+            self.wfile.write(self.body[:100])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(self.body)
+
+
+class GetWithRetriesTest(unittest.TestCase):
+    def setUp(self):
+        _FlakyHandler.hits = 0
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/page"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_mid_body_reset_is_retried(self):
+        with mock.patch.object(net, "_backoff_delay", return_value=0.0), net.build_session() as session:
+            html = net.fetch_html(session, self.url, timeout=5, retries=3)
+        self.assertEqual(html, _FlakyHandler.body.decode("utf-8"))
+        self.assertEqual(_FlakyHandler.hits, 2)
+
+    def test_mid_body_reset_without_retries_fails(self):
+        with mock.patch.object(net, "_backoff_delay", return_value=0.0), net.build_session() as session:
+            with self.assertRaises(RuntimeError):
+                net.fetch_html(session, self.url, timeout=5, retries=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
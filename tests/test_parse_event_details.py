@@ -0,0 +1,31 @@
+# tests/test_parse_event_details.py
+import unittest
+
+from tests._fixtures import BASE, read_expected, read_html
+from ufcstats.parse_event_details import EventFight, parse_event_details
+
+
+class ParseEventDetailsTest(unittest.TestCase):
+    def test_fixture_rows(self):
+        expected = read_expected("event_details")
+        event_meta, fights = parse_event_details(read_html("event_details"), base_url=BASE)
+
+        self.assertEqual(event_meta, expected["event_meta"])
+        self.assertTrue(all(isinstance(f, EventFight) for f in fights))
+        self.assertEqual([f._asdict() for f in fights], expected["fights"])
+
+    def test_fighter_links_come_from_fighter_cell(self):
+        _, fights = parse_event_details(read_html("event_details"), base_url=BASE)
+        for f in fights:
+            self.assertIn("/fighter-details/", f.fighter_1_url)
+            self.assertIn("/fighter-details/", f.fighter_2_url)
+            self.assertIn("/fight-details/", f.fight_url)
+
+    def test_empty_page(self):
+        meta, fights = parse_event_details("<html></html>", base_url=BASE)
+        self.assertEqual(meta, {"event_name": "", "event_date_raw": "", "event_location_raw": ""})
+        self.assertEqual(fights, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
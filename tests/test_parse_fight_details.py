@@ -0,0 +1,24 @@
+# tests/test_parse_fight_details.py
+import unittest
+
+from tests._fixtures import read_expected, read_html
+from ufcstats.parse_fight_details import parse_fight_details
+
+FIGHT_URL = "http://ufcstats.com/fight-details/aaa111"
+
+
+class ParseFightDetailsTest(unittest.TestCase):
+    def test_fixture_row(self):
+        row = parse_fight_details(html=read_html("fight_details"), snapshot="2024-01-01", fight_url=FIGHT_URL)
+        expected = read_expected("fight_details")
+        self.assertEqual(row, expected)
+        self.assertEqual(list(row), list(expected))  # column order is the CSV header
+
+    def test_empty_page_keeps_schema(self):
+        row = parse_fight_details(html="<html></html>", snapshot="s", fight_url="u")
+        self.assertEqual(list(row), list(read_expected("fight_details")))
+        self.assertEqual({k: v for k, v in row.items() if k not in ("snapshot", "fight_url") and v}, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,19 @@
+# tests/test_parse_fighter_details.py
+import unittest
+
+from tests._fixtures import read_expected, read_html
+from ufcstats.parse_fighter_details import parse_fighter_details
+
+
+class ParseFighterDetailsTest(unittest.TestCase):
+    def test_fixture_row(self):
+        self.assertEqual(parse_fighter_details(read_html("fighter_details")), read_expected("fighter_details"))
+
+    def test_empty_page(self):
+        row = parse_fighter_details("<html></html>")
+        self.assertEqual(set(row), set(read_expected("fighter_details")))
+        self.assertEqual(set(row.values()), {""})
+
+
+if __name__ == "__main__":
+    unittest.main()
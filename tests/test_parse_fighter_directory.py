@@ -0,0 +1,83 @@
+# tests/test_parse_fighter_directory.py
+import unittest
+from unittest import mock
+
+from ufcstats import parse_fighter_directory as pfd
+from tests._fixtures import BASE, read_expected, read_html
+
+
+def _row(fid: str, first: str, last: str, td_open: str = "<td>") -> str:
+    link = f'<a href="{BASE}/fighter-details/{fid}">'
+    vals = [f"{link}{first}</a>", f"{link}{last}</a>", "", "5' 11\"", "155 lbs.", "--", "Orthodox", "1", "2", "0", ""]
+    return "<tr>" + "".join(f"{td_open}{v}</td>" for v in vals) + "</tr>"
+
+
+def _page(*rows: str) -> str:
+    return (
+        '<html><body><table class="b-statistics__table"><thead><tr><th>First</th></tr></thead><tbody>'
+        '<tr class="b-statistics__table-row"><td class="b-statistics__table-col_type_clear"></td></tr>'
+        + "".join(rows)
+        + "</tbody></table></body></html>"
+    )
+
+
+class FighterDirectoryRegexPathTest(unittest.TestCase):
+    def test_regular_page_uses_regex_path(self):
+        html = _page(_row("a1", "Tom", "Aaron"), _row("b2", "Danny", "Abbadi"))
+        regex_rows = pfd._regex_rows(html)
+        self.assertIsNotNone(regex_rows)
+        self.assertEqual(regex_rows, list(pfd._lxml_rows(html)))
+        self.assertEqual([r["last_name"] for r in pfd.parse_fighter_directory(html, BASE)], ["Aaron", "Abbadi"])
+
+    def test_irregular_row_falls_back_to_lxml(self):
+        # Middle row has an unclosed <td>: fine for an HTML parser, not for the cell regex.
+        bad = _row("b2", "Danny", "Abbadi").replace("<td>155 lbs.</td>", "<td>155 lbs.", 1)
+        html = _page(_row("a1", "Tom", "Aaron"), bad, _row("c3", "José", "Ñoño"))
+        self.assertIsNone(pfd._regex_rows(html))
+
+        rows = pfd.parse_fighter_directory(html, BASE)
+        self.assertEqual([r["last_name"] for r in rows], ["Aaron", "Abbadi", "Ñoño"])
+        # lxml closes the cell implicitly, so the row's columns stay aligned.
+        self.assertEqual((rows[1]["weight_raw"], rows[1]["reach_raw"], rows[1]["stance_raw"]), ("155 lbs.", "--", "Orthodox"))
+
+    def test_short_row_falls_back_to_lxml(self):
+        short = "<tr>" + "".join(f"<td>{v}</td>" for v in ['<a href="/fighter-details/d4">Al</a>', "Bo", "", "", "", "", "", "3"]) + "</tr>"
+        html = _page(_row("a1", "Tom", "Aaron"), short)
+        self.assertIsNone(pfd._regex_rows(html))
+        self.assertEqual([r["first_name"] for r in pfd.parse_fighter_directory(html, BASE)], ["Tom", "Al"])
+
+
+    def test_fallback_page_matches_lxml_only_parse(self):
+        bad = _row("b2", "Danny", "Abbadi").replace("<td>155 lbs.</td>", "<td>155 lbs.", 1)
+        html = _page(_row("a1", "Tom", "Aaron"), bad)
+        with mock.patch.object(pfd, "_regex_rows", return_value=None):
+            lxml_only = pfd.parse_fighter_directory(html, BASE)
+        self.assertEqual(pfd.parse_fighter_directory(html, BASE), lxml_only)
+
+
+class FighterDirectoryFixtureTest(unittest.TestCase):
+    """Full-page layout: nav, search form and header/footer tables around the data table."""
+
+    def setUp(self):
+        self.html = read_html("fighter_directory")
+
+    def test_regex_path_runs_on_full_page(self):
+        regex_rows = pfd._regex_rows(self.html)
+        self.assertIsNotNone(regex_rows)
+        self.assertEqual(regex_rows, list(pfd._lxml_rows(self.html)))
+
+    def test_rows_match_lxml_only_parse(self):
+        with mock.patch.object(pfd, "_regex_rows", return_value=None):
+            lxml_only = pfd.parse_fighter_directory(self.html, BASE)
+        self.assertEqual(pfd.parse_fighter_directory(self.html, BASE), lxml_only)
+
+    def test_rows_match_expected(self):
+        self.assertEqual(pfd.parse_fighter_directory(self.html, BASE), read_expected("fighter_directory"))
+
+    def test_similar_class_is_not_the_data_table(self):
+        html = self.html.replace('class="b-statistics__table"', 'class="b-statistics__table-events"')
+        self.assertIsNone(pfd._regex_rows(html))
+
+
+if __name__ == "__main__":
+    unittest.main()
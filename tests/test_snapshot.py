@@ -0,0 +1,51 @@
+# tests/test_snapshot.py
+import tempfile
+import unittest
+from pathlib import Path
+
+from ufcstats.snapshot import ParseMemo, page_fingerprint
+
+
+class ParseMemoTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.parser = self.root / "parse_page.py"
+        self.dep = self.root / "_text.py"
+        self.parser.write_text("def parse(html): ...\n")
+        self.dep.write_text("def clean_text(s): ...\n")
+        self.memo_path = self.root / "parsed" / "page.json"
+        self.fp = page_fingerprint(b"<html>same page</html>")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _memo(self) -> ParseMemo:
+        return ParseMemo(self.memo_path, str(self.parser), shared_sources=[self.dep])
+
+    def _seed(self) -> None:
+        memo = self._memo()
+        memo.store("u", self.fp, {"a": "1"})
+        memo.save()
+
+    def test_unchanged_sources_reuse_rows(self):
+        self._seed()
+        self.assertEqual(self._memo().lookup("u", self.fp), {"a": "1"})
+
+    def test_changed_page_misses(self):
+        self._seed()
+        self.assertIsNone(self._memo().lookup("u", page_fingerprint(b"<html>new</html>")))
+
+    def test_editing_parser_invalidates(self):
+        self._seed()
+        self.parser.write_text("def parse(html): return 2\n")
+        self.assertIsNone(self._memo().lookup("u", self.fp))
+
+    def test_editing_shared_dependency_invalidates(self):
+        self._seed()
+        self.dep.write_text("def clean_text(s): return s.strip()\n")
+        self.assertIsNone(self._memo().lookup("u", self.fp))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+# ufcstats/_text.py
+from __future__ import annotations
+
+import sys
+
+
+def clean_text(s: str) -> str:
+    """Collapse whitespace runs to single spaces and trim; None/"" -> ""."""
+    # str.split() already treats \xa0 (nbsp), tabs and newlines as whitespace
+    # and drops leading/trailing runs, so no translate/replace pass is needed.
+    return " ".join(s.split()) if s else ""
+
+
+def intern_text(s: str) -> str:
+    """
+    Shared copy of a low-cardinality value (weight class, method, stance, ...),
+    so thousands of rows reference one string object instead of one each.
+    Only for fields with a small, bounded set of values.
+    """
+    return sys.intern(s)
@@ -4,6 +4,18 @@ from __future__ import annotations
 import pandas as pd
 
 
+def _has_positive(df: pd.DataFrame, col: str) -> pd.Series:
+    """
+    Boolean mask: int(col) >= 1, with missing/blank/non-numeric treated as 0.
+
+    One to_numeric pass, then fillna/ge in pandas (numpy isn't a declared
+    dependency); `>= 1` matches the old `astype(int) > 0`, which truncated toward zero.
+    """
+    if col not in df.columns:
+        raise ValueError(f"Missing required column: '{col}'")
+    return pd.to_numeric(df[col], errors="coerce").fillna(0).ge(1)
+
+
 def filter_has_fights(df: pd.DataFrame, fight_col: str = "fight_count") -> pd.DataFrame:
     """
     Keep only fighters with at least 1 recorded fight on UFCStats.
@@ -11,11 +23,7 @@ def filter_has_fights(df: pd.DataFrame, fight_col: str = "fight_count") -> pd.Da
     - Treat missing/blank fight_count as 0.
     - Returns a copy (safe for chaining).
     """
-    if fight_col not in df.columns:
-        raise ValueError(f"Missing required column: '{fight_col}'")
-
-    fights = pd.to_numeric(df[fight_col], errors="coerce").fillna(0).astype(int)
-    return df.loc[fights > 0].copy()
+    return df.loc[_has_positive(df, fight_col)].copy()
 
 
 def report_excluded_no_fights(
@@ -30,22 +38,17 @@ def report_excluded_no_fights(
 
     Useful for sanity checking directory-only profiles (e.g., Mike Zichelle-like cases).
     """
-    if fight_col not in df.columns:
-        raise ValueError(f"Missing required column: '{fight_col}'")
-
-    fights = pd.to_numeric(df[fight_col], errors="coerce").fillna(0).astype(int)
-    excluded = df.loc[fights <= 0].copy()
+    excluded = df.loc[~_has_positive(df, fight_col)].copy()
 
     if len(excluded) > 0 and max_print > 0:
         print("=== Excluded: fight_count == 0 (directory-only / no UFCStats fight log) ===")
-        cols = [c for c in [*name_cols, url_col, fight_col] if c in excluded.columns]
-        preview = excluded[cols].head(max_print)
-
-        for _, r in preview.iterrows():
-            first = str(r.get(name_cols[0], "")).strip()
-            last = str(r.get(name_cols[1], "")).strip()
-            url = str(r.get(url_col, "")).strip()
-            bc = r.get(fight_col, "")
+        # Fixed column order (absent name/url columns read as ""), then plain tuples.
+        preview = excluded.head(max_print).reindex(columns=[*name_cols, url_col, fight_col], fill_value="")
+
+        for first, last, url, bc in preview.itertuples(index=False, name=None):
+            first = str(first).strip()
+            last = str(last).strip()
+            url = str(url).strip()
             name = f"{first} {last}".strip() or "(no name)"
             print(f"- {name} | fights={bc} | {url}")
 
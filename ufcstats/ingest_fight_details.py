@@ -1,119 +1,265 @@
-# scripts/ingest/ingest_fight_details.py
+# ufcstats/ingest_fight_details.py
 from __future__ import annotations
 
 import argparse
 import csv
+import multiprocessing
 import sys
-import time
+from collections import deque
+from concurrent.futures import CancelledError, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional
 
 import requests
 
-from ufcstats.net import fetch_html, normalize_ufcstats_url, pick_base_url
-from ufcstats.snapshot import default_snapshot_utc, infer_snapshot_from_path
-
-# You will create this next:
+from ufcstats.net import (
+    DEFAULT_CACHE_DIR,
+    RateLimiter,
+    build_session,
+    fetch_html_cached,
+    normalize_ufcstats_url,
+    pick_base_url,
+)
+from ufcstats import parse_fight_details as _parser
 from ufcstats.parse_fight_details import parse_fight_details
+from ufcstats.snapshot import ParseMemo, default_snapshot_utc, infer_snapshot_from_path, page_fingerprint
+
 
 RAW_BASENAME = "fight_details__ufcstats__{snapshot}.csv"
 
+# Rows per write batch (one writerows + flush for the CSV and its .done sidecar).
+FLUSH_EVERY = 100
 
-def read_event_details_csv(path: Path) -> List[Dict[str, str]]:
+
+def read_csv_column(path: Path, column: str) -> List[str]:
     """
-    Expect at least:
-      fight_url
-    Typically also:
-      snapshot, event_url, fight_order, fighter_1_url, fighter_2_url, ...
+    Stripped, non-empty values of a single CSV column, in file order.
+    Streams the file with csv.reader; no DataFrame of unused columns is built.
     """
-    if not path.exists():
-        raise FileNotFoundError(f"Event details CSV not found: {path}")
-
     with path.open("r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
-    if not rows:
-        return []
-
-    if "fight_url" not in rows[0]:
-        raise ValueError(f"Expected column 'fight_url' in {path}, got: {list(rows[0].keys())}")
-
-    return rows
-
-
-def write_csv(rows: List[Dict[str, str]], outpath: Path) -> None:
-    outpath.parent.mkdir(parents=True, exist_ok=True)
-    if not rows:
-        # still write headerless file? prefer explicit header to avoid downstream surprises
-        outpath.write_text("", encoding="utf-8")
-        return
-
-    fieldnames = list(rows[0].keys())
-    with outpath.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        w.writerows(rows)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return []
+        if column not in header:
+            raise ValueError(f"Expected column '{column}' in {path}, got: {header}")
+        idx = header.index(column)
+        return [v for v in (row[idx].strip() for row in reader if len(row) > idx) if v]
+
+
+def _fetch_and_parse(
+    session: requests.Session,
+    url: str,
+    snapshot: str,
+    limiter: RateLimiter,
+    timeout: int,
+    retries: int,
+    cache_dir: Optional[Path],
+    refresh: bool,
+    memo: Optional[ParseMemo] = None,
+    parse_pool: Optional[Executor] = None,
+) -> Optional[Dict[str, str]]:
+    """
+    Fetch + parse one fight page (runs in a worker thread). None on fetch or
+    parse failure (already reported on stderr); caching, retry and backoff
+    live in fetch_html_cached. A page identical to the one seen last time
+    reuses that parse from `memo`, restamped with this snapshot.
+    With `parse_pool`, the parse itself runs in a worker process (this thread
+    just waits on it), so parsing isn't serialized on the GIL.
+    """
+    try:
+        html = fetch_html_cached(
+            session,
+            url,
+            cache_dir=cache_dir,
+            timeout=timeout,
+            retries=retries,
+            refresh=refresh,
+            limiter=limiter,
+        )
+    except Exception as e:
+        print(f"FAIL fetch {url}: {e}", file=sys.stderr)
+        return None
+
+    fingerprint = ""
+    if memo is not None:
+        fingerprint = page_fingerprint(html.encode("utf-8"))
+        row = memo.lookup(url, fingerprint)
+        if row is not None:
+            row["snapshot"] = snapshot
+            return row
+
+    try:
+        if parse_pool is not None:
+            row = parse_pool.submit(parse_fight_details, html, snapshot, url).result()
+        else:
+            row = parse_fight_details(html=html, snapshot=snapshot, fight_url=url)
+    except BrokenProcessPool:
+        # A dead worker process (OOM-killed, crashed) fails every later submit too;
+        # stop the run instead of logging each remaining page as a parse failure.
+        raise
+    except CancelledError:
+        # parse_pool shut down under us (run aborted); nothing to report.
+        return None
+    except Exception as e:
+        print(f"FAIL parse {url}: {e}", file=sys.stderr)
+        return None
+
+    if memo is not None:
+        memo.store(url, fingerprint, row)
+    return row
 
 
 def ingest_fight_details(
     input_event_details: Path,
     outdir: Path,
     snapshot: str,
-    sleep_s: float = 0.25,
+    sleep_s: float = 1.0,
     timeout: int = 30,
     retries: int = 3,
-) -> Path:
-    base_rows = read_event_details_csv(input_event_details)
-
-    # de-dupe fight urls
-    fight_urls: List[str] = []
-    seen: Set[str] = set()
-    for r in base_rows:
-        u = (r.get("fight_url") or "").strip()
-        if not u:
-            continue
-        if u not in seen:
-            seen.add(u)
-            fight_urls.append(u)
+    limit: int | None = None,
+    resume: bool = False,
+    workers: int = 8,
+    session: Optional[requests.Session] = None,
+    cache_dir: Optional[Path] = None,
+    refresh: bool = False,
+    parse_procs: int = 0,
+    ):
+    """
+    Fetch every fight_url from an event_details snapshot and append one row per fight.
+    Pass `session` to reuse an existing connection pool (e.g. from the pipeline runner).
+    If `cache_dir` is set, fight pages (final once the fight is over) are served
+    from that cache; `refresh=True` revalidates them with a conditional GET.
+    Parsed rows are memoized in `cache_dir/parsed/fight-details.json` by page
+    fingerprint, so unchanged pages aren't re-parsed on the next snapshot.
+    `parse_procs > 0` parses pages in that many worker processes; worthwhile when
+    most pages come from the cache and parsing, not the network, is the bottleneck.
+    """
 
+    outdir.mkdir(parents=True, exist_ok=True)
     outpath = outdir / RAW_BASENAME.format(snapshot=snapshot)
 
-    session = requests.Session()
-    base = pick_base_url(session)
-
-    all_rows: List[Dict[str, str]] = []
-
-    for i, fight_url in enumerate(fight_urls, start=1):
-        norm_url = normalize_ufcstats_url(fight_url, base)
-
+    # 1) Read event_details and extract fight_url list (dedupe, keep order)
+    fight_urls = list(dict.fromkeys(read_csv_column(input_event_details, "fight_url")))
+    if limit:
+        fight_urls = fight_urls[:limit]
+        print(f"[TEST MODE] Processing only {len(fight_urls)} fights")
+
+    # 2) Resume: load already-done fight_urls. The `.done` sidecar (one fight_url
+    # per line, appended as rows are written) is a fast index; the CSV stays
+    # authoritative and is only re-read when the sidecar is missing. Seed it from
+    # an existing CSV on every run, resume or not: appending to a sidecar that
+    # never listed the CSV's earlier rows would make a later --resume refetch them.
+    done_path = outpath.with_suffix(".done")
+    if outpath.exists() and not done_path.exists():
         try:
-            html = fetch_html(session, norm_url, timeout=timeout, retries=retries)
-            # parse_fight_details should return either:
-            #   - one dict row (fight-level totals)
-            #   - OR multiple rows (e.g., totals + significant strikes totals)
-            parsed = parse_fight_details(html=html, fight_url=norm_url, snapshot=snapshot)
-
-            if isinstance(parsed, dict):
-                all_rows.append(parsed)
-            else:
-                all_rows.extend(parsed)
-
-        except Exception as e:
-            print(f"[WARN] Failed fight {i}/{len(fight_urls)}: {norm_url} :: {e}", file=sys.stderr)
-
-        time.sleep(sleep_s)
-
-    if all_rows:
-        write_csv(all_rows, outpath)
-        print(f"Wrote {len(all_rows)} fight rows → {outpath}")
-    else:
-        outpath.write_text("", encoding="utf-8")
-        print(f"Wrote 0 fight rows → {outpath}")
-
+            seed = list(dict.fromkeys(read_csv_column(outpath, "fight_url")))
+        except Exception:
+            seed = []
+        done_path.write_text("".join(u + "\n" for u in seed), encoding="utf-8")
+    done = set()
+    if resume and outpath.exists():
+        done = set(done_path.read_text(encoding="utf-8").splitlines())
+
+    session = session or build_session(pool_size=workers)
+    base = pick_base_url(session)
+    # Shared across workers: sleep_s is the spacing between request starts.
+    limiter = RateLimiter(sleep_s)
+    memo = ParseMemo(Path(cache_dir) / "parsed" / "fight-details.json", _parser.__file__) if cache_dir is not None else None
+
+    # 3) CSV writer (append if exists); rows go out in batches of FLUSH_EVERY
+    is_new = not outpath.exists()
+    f = open(outpath, "a", newline="", encoding="utf-8", buffering=1 << 20)
+    writer = csv.writer(f)
+    # A fresh CSV starts a fresh sidecar; otherwise keep appending to both.
+    done_f = open(done_path, "w" if is_new else "a", encoding="utf-8", buffering=1 << 20)
+    fieldnames: List[str] = []
+
+    batch: List[List[str]] = []
+    batch_urls: List[str] = []
+
+    def write_batch() -> None:
+        # One writerows() + flush per batch, CSV first, so the sidecar never
+        # lists a row that isn't on disk.
+        if not batch:
+            return
+        writer.writerows(batch)
+        f.flush()
+        done_f.write("".join(u + "\n" for u in batch_urls))
+        done_f.flush()
+        batch.clear()
+        batch_urls.clear()
+
+    processed = 0
+    # spawn, not fork: the fetch threads (and their open sockets) are already running.
+    parse_pool = (
+        ProcessPoolExecutor(max_workers=parse_procs, mp_context=multiprocessing.get_context("spawn"))
+        if parse_procs > 0
+        else None
+    )
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = deque(
+            ex.submit(
+                _fetch_and_parse,
+                session,
+                normalize_ufcstats_url(raw_url, base),
+                snapshot,
+                limiter,
+                timeout,
+                retries,
+                cache_dir,
+                refresh,
+                memo,
+                parse_pool,
+            )
+            for raw_url in fight_urls
+            if raw_url not in done
+        )
+
+        # Drain in submission order so the output keeps input order; popping each
+        # future drops our reference to its row once it's batched for writing.
+        while futures:
+            row = futures.popleft().result()
+            if row is None:
+                continue
+
+            # fix column order once we know columns
+            if not fieldnames:
+                fieldnames = list(row.keys())
+                if is_new:
+                    writer.writerow(fieldnames)
+
+            batch.append([row.get(k, "") for k in fieldnames])
+            batch_urls.append(row["fight_url"])
+
+            processed += 1
+            if len(batch) >= FLUSH_EVERY:
+                write_batch()
+            if processed % 25 == 0:
+                print(f"Processed {processed} fights… last={row['fight_url']}")
+
+    finally:
+        # On error / Ctrl-C, drop queued fetches instead of draining them all.
+        # Stop the parse pool before joining the threads: a thread blocked on a
+        # queued parse only returns once that parse is cancelled.
+        ex.shutdown(wait=False, cancel_futures=True)
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+        ex.shutdown(wait=True)
+        # Rows already parsed are complete; keep them.
+        write_batch()
+        f.close()
+        done_f.close()
+        if memo is not None:
+            memo.save()
+
+    print(f"Wrote {processed} fights → {outpath}")
     return outpath
 
 
+
 def build_argparser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Ingest UFCStats fight-details pages (fight-level).")
     p.add_argument(
@@ -121,11 +267,28 @@ def build_argparser() -> argparse.ArgumentParser:
         required=True,
         help="Path to event_details__ufcstats__{snapshot}.csv (must contain fight_url column).",
     )
-    p.add_argument("--outdir", default=str(Path("data") / "raw"), help="Output directory (default: data/raw).")
-    p.add_argument("--snapshot", default="", help="Snapshot date YYYY-MM-DD (default inferred or UTC today).")
-    p.add_argument("--sleep", default="0.25", help="Delay between requests (seconds).")
-    p.add_argument("--timeout", default="30", help="Request timeout (seconds).")
-    p.add_argument("--retries", default="3", help="Retries per request.")
+    p.add_argument("--outdir", default=str(Path("data") / "raw"),
+                   help="Output directory (default: data/raw).")
+    p.add_argument("--snapshot", default="",
+                   help="Snapshot date YYYY-MM-DD (default inferred or UTC today).")
+    p.add_argument("--sleep", default="0.25",
+                   help="Minimum delay between request starts, across all workers (seconds).")
+    p.add_argument("--timeout", default="30",
+                   help="Request timeout (seconds).")
+    p.add_argument("--retries", default="3",
+                   help="Retries per request.")
+    p.add_argument("--limit", type=int, default=None,
+                   help="Process only the first N fights (testing mode).")
+    p.add_argument("--resume", action="store_true",
+                   help="Skip fights already written to output file.")
+    p.add_argument("--workers", type=int, default=8,
+                   help="Concurrent fetch threads (default: 8). Request rate is still bounded by --sleep.")
+    p.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                   help="On-disk HTML cache for fight pages (default: data/cache/html). Pass '' to disable.")
+    p.add_argument("--refresh", action="store_true",
+                   help="Revalidate cached fight pages with the server (conditional GET).")
+    p.add_argument("--parse-procs", type=int, default=0,
+                   help="Parse pages in N worker processes (default: 0 = parse in the fetch threads).")
     return p
 
 
@@ -147,6 +310,12 @@ def main(argv: List[str] | None = None) -> int:
         sleep_s=float(args.sleep),
         timeout=int(args.timeout),
         retries=int(args.retries),
+        limit=args.limit,
+        resume=args.resume,
+        workers=args.workers,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        refresh=args.refresh,
+        parse_procs=args.parse_procs,
     )
     return 0
 
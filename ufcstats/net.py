@@ -1,63 +1,406 @@
 # ufcstats/net.py
+import functools
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import socket
+import threading
 import time
+import lxml.html
+from lxml import etree
 import requests
-from typing import Optional
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from typing import Dict, Optional, Tuple, Union
+
+# lxml parsers are reusable but must not be shared between threads
+# (the ingest scripts parse in worker threads), so keep one per thread.
+_parser_local = threading.local()
+
+# Options for every page parser. PIs are dropped from the tree and external
+# resources are never fetched. Comments are kept: removing them merges the
+# text on either side ("a<!-- -->b" -> "ab"), which would change extracted
+# values; node_text() and the selectors skip them anyway.
+_PARSER_OPTIONS = dict(encoding="utf-8", remove_pis=True, no_network=True)
+
+# Default location of the fetch_html_cached page cache (relative to the repo root).
+DEFAULT_CACHE_DIR = Path("data") / "cache" / "html"
+
+# Host-less path prefixes fetch_html_cached always fetches fresh and never
+# stores: listings that change whenever an event is scheduled or completed.
+SKIP_CACHE_PREFIXES = (
+    "/statistics/events/upcoming",
+    "/statistics/events/completed",
+    "/statistics/fighters?",
+)
+
+
+# urllib3's defaults (TCP_NODELAY) plus TCP keepalive, so pooled connections
+# that sit idle between stages are probed instead of silently dropped.
+_KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, "TCP_KEEPIDLE"):  # Linux; not available on macOS/Windows
+    _KEEPALIVE_SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", _KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+# Identify the scraper instead of sending the generic python-requests UA.
+USER_AGENT = f"ufcstats-scraper (python-requests/{requests.__version__})"
+
+
+def build_session(pool_size: int = 10) -> requests.Session:
+    """
+    Create a Session whose connection pool can serve `pool_size` concurrent workers.
+    requests' default pool keeps 10 connections per host; extra threads would
+    otherwise open (and discard) a fresh connection per request.
+    Sockets have TCP keepalive on, so reused connections (and their DNS
+    lookups) survive idle gaps.
+
+    Build one per run and pass it down (the pipeline runner shares one across
+    all stages): connection and TLS reuse only happen within a Session.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT, "Connection": "keep-alive"})
+    # max_retries=0: retries/backoff are handled by _get_with_retries.
+    adapter = _KeepAliveAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class RateLimiter:
+    """
+    Thread-safe request pacing: at most one wait() returns every `interval_s` seconds.
+    Replaces a per-loop time.sleep() once fetches run concurrently, so the
+    overall request rate against UFCStats stays the same.
+    """
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = max(0.0, float(interval_s))
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        if self.interval_s <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval_s
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# pick_base_url() result, shared by every stage in this process.
+_base_url: Optional[str] = None
+_base_url_lock = threading.Lock()
 
 
 def pick_base_url(session: requests.Session) -> str:
     """
     Determine a reachable UFCStats base URL.
     Tries HTTPS first, then HTTP.
+
+    The UFCSTATS_BASE_URL env var skips the probe entirely; otherwise the
+    first successful probe is remembered for the rest of the process, so the
+    pipeline's stages don't each pay for it.
     """
-    for base in ("https://www.ufcstats.com", "http://ufcstats.com"):
-        try:
-            r = session.get(base, timeout=10)
-            r.raise_for_status()
-            return base
-        except Exception:
-            continue
+    global _base_url
+    override = os.environ.get("UFCSTATS_BASE_URL", "").strip().rstrip("/")
+    if override:
+        return override
+
+    with _base_url_lock:
+        if _base_url is not None:
+            return _base_url
+        for base in ("https://www.ufcstats.com", "http://ufcstats.com"):
+            try:
+                # Only the status matters; stream=True skips downloading the homepage body.
+                with session.get(base, timeout=10, stream=True) as r:
+                    r.raise_for_status()
+                _base_url = base
+                return base
+            except Exception:
+                continue
     raise RuntimeError("Could not reach UFCStats over https or http.")
 
 
+def parse_html(html: Union[str, bytes]) -> lxml.html.HtmlElement:
+    """
+    Parse a UFCStats page into an lxml.html document, reusing this thread's parser.
+    Shared by all parse_* modules.
+
+    Accepts str, or raw bytes, which are taken as UTF-8 (the parser's fixed
+    encoding) and never sniffed.
+    """
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = lxml.html.HTMLParser(**_PARSER_OPTIONS)
+    return lxml.html.document_fromstring(html if (html or "").strip() else "<html></html>", parser=parser)
+
+
+def html_pull_parser(tag: str) -> etree.HTMLPullParser:
+    """
+    Incremental counterpart of parse_html (same parser options): feed() the page
+    in chunks and read_events() yields ("end", element) for each closed <tag>,
+    so callers can process and clear elements instead of holding the whole tree.
+    """
+    return etree.HTMLPullParser(events=("end",), tag=tag, **_PARSER_OPTIONS)
+
+
+# Text nodes under an element, minus <script>/<style> bodies (bs4's get_text skips those too).
+_TEXT_NODES = etree.XPath(".//text()[not(parent::script) and not(parent::style)]", smart_strings=False)
+
+
+def node_text(el, sep: str = " ") -> str:
+    """
+    Same as BeautifulSoup's el.get_text(sep, strip=True): stripped text nodes joined by sep.
+    """
+    if el is None:
+        return ""
+    return sep.join(t.strip() for t in _TEXT_NODES(el) if t.strip())
+
+
+# http/https, with or without www: the host prefixes normalize_ufcstats_url rewrites.
+_UFCSTATS_HOST_RE = re.compile(r"https?://(?:www\.)?ufcstats\.com")
+
+
+@functools.lru_cache(maxsize=16384)
 def normalize_ufcstats_url(url: str, base: str) -> str:
     """
     Normalize any UFCStats URL to the selected base host.
+
+    Memoized: the same fighter/fight URLs recur across every event page, and
+    `base` is fixed for a run.
     """
     u = (url or "").strip()
     if not u:
         return u
 
-    prefixes = (
-        "https://ufcstats.com",
-        "http://ufcstats.com",
-        "https://www.ufcstats.com",
-        "http://www.ufcstats.com",
-    )
-    for p in prefixes:
-        if u.startswith(p):
-            return base + u[len(p):]
-    return u
+    m = _UFCSTATS_HOST_RE.match(u)
+    return base + u[m.end():] if m else u
 
 
-def fetch_html(
+# Worth retrying: the server or network is struggling, not the request itself.
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 30.0
+
+# Transport failures worth another attempt: timeouts, refused/reset connections,
+# and a body cut off or garbled mid-transfer (common on large page=all listings).
+RETRY_EXCEPTIONS = (
+    requests.Timeout,
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+)
+
+# Hard cap on a (decompressed) response body. The largest real page, the
+# page=all events listing, is a few MB; anything past this is not a UFCStats page.
+MAX_RESPONSE_BYTES = 32 * 1024 * 1024
+_READ_CHUNK = 1 << 16
+
+
+def _backoff_delay(attempt: int, resp: Optional[requests.Response] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1-based): full-jitter
+    exponential backoff, uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2**attempt)).
+    A numeric Retry-After on a 429/503 is honored (capped at BACKOFF_MAX_S).
+    """
+    retry_after = resp.headers.get("Retry-After", "") if resp is not None else ""
+    if retry_after.strip().isdigit():
+        return min(BACKOFF_MAX_S, float(retry_after))
+    return random.uniform(0.0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * (2 ** attempt)))
+
+
+def _get_with_retries(
     session: requests.Session,
     url: str,
     params: Optional[dict] = None,
     timeout: int = 30,
     retries: int = 3,
-) -> str:
+    headers: Optional[dict] = None,
+) -> requests.Response:
     """
-    Fetch HTML with retry and backoff.
-    Shared across all UFCStats ingestion scripts.
+    GET with up to `retries` attempts. Only RETRY_EXCEPTIONS (timeouts, connection
+    errors, truncated/undecodable bodies) and RETRY_STATUS responses are retried;
+    anything else (e.g. a 404) fails at once.
+    Every failure surfaces as RuntimeError, including a body over
+    MAX_RESPONSE_BYTES (not retried).
     """
-    last_err = None
+    last_err: Optional[Exception] = None
     for attempt in range(1, retries + 1):
+        resp = None
         try:
-            resp = session.get(url, params=params, timeout=timeout)
-            resp.raise_for_status()
-            return resp.text
-        except Exception as e:
+            # stream=True + with-block: error responses are closed without
+            # downloading their body, and the connection goes straight back
+            # to the pool once the body below has been read.
+            with session.get(url, params=params, timeout=timeout, headers=headers, stream=True) as resp:
+                resp.raise_for_status()
+                # read the body while the connection is held, stopping at the cap
+                resp._content = _read_capped(resp, url)
+            return resp
+        except RETRY_EXCEPTIONS as e:
             last_err = e
-            time.sleep(0.75 * attempt)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code not in RETRY_STATUS:
+                raise RuntimeError(f"Failed to fetch {url}: {e}") from e
+            last_err = e
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to fetch {url}: {e}") from e
+
+        if attempt < retries:
+            time.sleep(_backoff_delay(attempt, resp))
 
     raise RuntimeError(f"Failed to fetch {url} after {retries} attempts: {last_err}")
+
+
+def _read_capped(resp: requests.Response, url: str) -> bytes:
+    declared = resp.headers.get("Content-Length", "")
+    if declared.isdigit() and int(declared) > MAX_RESPONSE_BYTES:
+        raise RuntimeError(f"Failed to fetch {url}: Content-Length {declared} exceeds {MAX_RESPONSE_BYTES} bytes")
+    body = bytearray()
+    for chunk in resp.iter_content(chunk_size=_READ_CHUNK):
+        body += chunk
+        if len(body) > MAX_RESPONSE_BYTES:
+            raise RuntimeError(f"Failed to fetch {url}: response body exceeds {MAX_RESPONSE_BYTES} bytes")
+    return bytes(body)
+
+
+def _decode_html(resp: requests.Response) -> str:
+    """
+    Body as text: the charset the server declared, else UTF-8 (what UFCStats serves).
+
+    resp.text would fall back to ISO-8859-1 for a bare text/html Content-Type
+    (mangling accented names), or run charset detection over the whole body
+    when there is no Content-Type at all.
+    """
+    content_type = resp.headers.get("Content-Type", "").lower()
+    encoding = resp.encoding if "charset=" in content_type and resp.encoding else "utf-8"
+    try:
+        return resp.content.decode(encoding, errors="replace")
+    except LookupError:  # unknown charset name
+        return resp.content.decode("utf-8", errors="replace")
+
+
+def fetch_html(
+    session: requests.Session,
+    url: str,
+    params: Optional[dict] = None,
+    timeout: int = 30,
+    retries: int = 3,
+) -> str:
+    """
+    Fetch HTML with retry and backoff.
+    Shared across all UFCStats ingestion scripts.
+    """
+    return _decode_html(_get_with_retries(session, url, params=params, timeout=timeout, retries=retries))
+
+
+def _cache_paths(cache_dir: Path, url: str) -> Tuple[Path, Path]:
+    """
+    (html blob, validator metadata) for a URL.
+    Keyed on the host-less path so http/https/www variants share one entry.
+    """
+    key = normalize_ufcstats_url(url, "") or url
+    h = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return cache_dir / f"{h}.html.gz", cache_dir / f"{h}.meta.json"
+
+
+def _skip_cache(url: str) -> bool:
+    return (normalize_ufcstats_url(url, "") or "").startswith(SKIP_CACHE_PREFIXES)
+
+
+def drop_cached(cache_dir: Path, url: str) -> None:
+    """
+    Remove a page from the cache, e.g. an event page fetched before its
+    results were posted, so the next run downloads it again.
+    """
+    for path in _cache_paths(Path(cache_dir), url):
+        path.unlink(missing_ok=True)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # temp file + rename: concurrent readers never see a partial file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _read_cached(blob_path: Path) -> Optional[str]:
+    if not blob_path.exists():
+        return None
+    try:
+        return gzip.decompress(blob_path.read_bytes()).decode("utf-8")
+    except (OSError, EOFError, UnicodeDecodeError):
+        return None  # truncated/corrupt entry: treat as a miss
+
+
+def _read_meta(meta_path: Path) -> Dict[str, str]:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def fetch_html_cached(
+    session: requests.Session,
+    url: str,
+    cache_dir: Optional[Path],
+    timeout: int = 30,
+    retries: int = 3,
+    refresh: bool = False,
+    limiter: Optional[RateLimiter] = None,
+) -> str:
+    """
+    fetch_html with an on-disk, gzip-compressed cache keyed by URL.
+
+    - cache_dir=None disables caching (plain fetch_html); so do URLs under
+      SKIP_CACHE_PREFIXES.
+    - A cached page is returned without any request.
+    - refresh=True revalidates cached pages with a conditional GET
+      (If-None-Match / If-Modified-Since); a 304 reuses the cached body.
+    - limiter (optional) is only waited on when the network is actually hit.
+    """
+    if cache_dir is None or _skip_cache(url):
+        if limiter is not None:
+            limiter.wait()
+        return fetch_html(session, url, timeout=timeout, retries=retries)
+
+    blob_path, meta_path = _cache_paths(Path(cache_dir), url)
+    cached = _read_cached(blob_path)
+    if cached is not None and not refresh:
+        return cached
+
+    headers: Dict[str, str] = {}
+    if cached is not None:
+        meta = _read_meta(meta_path)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    if limiter is not None:
+        limiter.wait()
+    resp = _get_with_retries(session, url, timeout=timeout, retries=retries, headers=headers or None)
+    if resp.status_code == 304 and cached is not None:
+        return cached
+
+    html = _decode_html(resp)
+    _write_atomic(blob_path, gzip.compress(html.encode("utf-8"), compresslevel=6))
+    meta = {
+        "url": url,
+        "etag": resp.headers.get("ETag", ""),
+        "last_modified": resp.headers.get("Last-Modified", ""),
+    }
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    return html
@@ -1,27 +1,66 @@
 # ufcstats/parse_event_details.py
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, NamedTuple, Tuple
 
-from bs4 import BeautifulSoup
+from lxml.cssselect import CSSSelector
 
-from ufcstats.net import normalize_ufcstats_url
+from ufcstats._text import clean_text, intern_text
+from ufcstats.net import node_text as _get_text
+from ufcstats.net import normalize_ufcstats_url, parse_html
 
+# Selectors compiled to XPath once at import (el.cssselect() would re-translate them per call).
+_SEL_LIST_ITEM = CSSSelector("li.b-list__box-list-item")
+_SEL_TITLE = CSSSelector("h2.b-content__title")
+_SEL_FIGHTS_TABLE = CSSSelector("table.b-fight-details__table")
+_SEL_TABLE = CSSSelector("table")
+_SEL_BODY_ROWS = CSSSelector("tbody tr")
+_SEL_CELLS = CSSSelector("td")
+_SEL_LINKS = CSSSelector("a[href]")
 
-def clean_text(s: str) -> str:
-    return " ".join((s or "").replace("\xa0", " ").split()).strip()
 
+class EventFight(NamedTuple):
+    """
+    One row of the event-details fight table (raw strings).
+    A plain tuple underneath: field order matches the raw event_details
+    columns that follow the event context, so writers can emit it directly.
+    """
 
-def _extract_labeled_value(soup: BeautifulSoup, label: str) -> str:
+    fight_url: str
+    fight_order: str
+    fighter_1_name: str
+    fighter_1_url: str
+    fighter_1_result: str
+    fighter_2_name: str
+    fighter_2_url: str
+    fighter_2_result: str
+    kd_1: str
+    str_1: str
+    td_1: str
+    sub_1: str
+    kd_2: str
+    str_2: str
+    td_2: str
+    sub_2: str
+    weight_class_raw: str
+    method_raw: str
+    round_raw: str
+    time_raw: str
+
+
+def _collect_labeled(root) -> Dict[str, str]:
     """
+    {label.lower(): value} for every "Label: value" item, in one pass:
     <li class="b-list__box-list-item">Date: January 24, 2026</li>
     <li class="b-list__box-list-item">Location: Las Vegas, Nevada, USA</li>
+    The first item with a given label wins.
     """
-    for li in soup.select("li.b-list__box-list-item"):
-        txt = clean_text(li.get_text(" ", strip=True))
-        if txt.lower().startswith(label.lower() + ":"):
-            return clean_text(txt.split(":", 1)[1])
-    return ""
+    out: Dict[str, str] = {}
+    for li in _SEL_LIST_ITEM(root):
+        label, sep, value = clean_text(_get_text(li)).partition(":")
+        if sep:
+            out.setdefault(label.lower(), clean_text(value))
+    return out
 
 
 def _two_lines(td) -> Tuple[str, str]:
@@ -31,7 +70,7 @@ def _two_lines(td) -> Tuple[str, str]:
       bottom fighter value
     We preserve ordering by splitting on newline.
     """
-    parts = [clean_text(p) for p in td.get_text("\n", strip=True).split("\n") if clean_text(p)]
+    parts = [clean_text(p) for p in _get_text(td, "\n").split("\n") if clean_text(p)]
     if len(parts) >= 2:
         return parts[0], parts[1]
     if len(parts) == 1:
@@ -39,13 +78,21 @@ def _two_lines(td) -> Tuple[str, str]:
     return "", ""
 
 
+# Whole-cell badge texts, mapped straight to the normalized result.
+_WL = {"": "", "WIN": "win", "LOSS": "loss", "DRAW": "draw", "NC": "nc", "NO CONTEST": "nc"}
+
+
 def _parse_wl(td) -> str:
     """
     The leftmost cell shows a WIN badge for the winner.
     We normalize to: win / loss / draw / nc / ""
     (Most commonly only 'win' is explicitly shown.)
     """
-    txt = clean_text(td.get_text(" ", strip=True)).upper()
+    txt = clean_text(_get_text(td)).upper()
+    hit = _WL.get(txt)
+    if hit is not None:
+        return hit
+    # Anything else (extra text in the cell): substring match, WIN first.
     if "WIN" in txt:
         return "win"
     if "LOSS" in txt:
@@ -57,7 +104,7 @@ def _parse_wl(td) -> str:
     return ""
 
 
-def parse_event_details_html(html: str, base_url: str) -> Tuple[Dict[str, str], List[Dict[str, str]]]:
+def parse_event_details_html(html: str, base_url: str) -> Tuple[Dict[str, str], List[EventFight]]:
     """
     Mirror of event-details page:
       https://ufcstats.com/event-details/<event_id>
@@ -68,7 +115,7 @@ def parse_event_details_html(html: str, base_url: str) -> Tuple[Dict[str, str],
         - event_date_raw
         - event_location_raw
 
-      fights: one row per fight with:
+      fights: one EventFight per fight with:
         - fight_url
         - fight_order
         - fighter_1_name, fighter_1_url, fighter_1_result
@@ -80,15 +127,16 @@ def parse_event_details_html(html: str, base_url: str) -> Tuple[Dict[str, str],
         - round_raw
         - time_raw
     """
-    soup = BeautifulSoup(html, "lxml")
+    root = parse_html(html)
 
     # Event title
-    title_el = soup.select_one("h2.b-content__title")
-    event_name = clean_text(title_el.get_text(" ", strip=True)) if title_el else ""
+    title_els = _SEL_TITLE(root)
+    event_name = clean_text(_get_text(title_els[0])) if title_els else ""
 
     # Event meta (Date / Location)
-    event_date_raw = _extract_labeled_value(soup, "Date")
-    event_location_raw = _extract_labeled_value(soup, "Location")
+    labeled = _collect_labeled(root)
+    event_date_raw = labeled.get("date", "")
+    event_location_raw = labeled.get("location", "")
 
     event_meta = {
         "event_name": event_name,
@@ -96,21 +144,26 @@ def parse_event_details_html(html: str, base_url: str) -> Tuple[Dict[str, str],
         "event_location_raw": event_location_raw,
     }
 
-    table = soup.select_one("table.b-fight-details__table") or soup.select_one("table")
-    fights: List[Dict[str, str]] = []
-    if not table:
+    tables = _SEL_FIGHTS_TABLE(root) or _SEL_TABLE(root)
+    fights: List[EventFight] = []
+    if not tables:
         return event_meta, fights
+    table = tables[0]
 
     fight_order = 0
 
-    for tr in table.select("tbody tr"):
-        tds = tr.select("td")
+    for tr in _SEL_BODY_ROWS(table):
+        tds = _SEL_CELLS(tr)
         if len(tds) < 10:
             continue
 
+        # One walk over the row's links; fight and fighter links are split by href.
+        # ("fighter-details" doesn't contain "fight-details", so the two can't overlap.)
+        links = [(a, a.get("href", "")) for a in _SEL_LINKS(tr)]
+
         # Fight details link (fight_url)
-        fight_a = tr.select_one('a[href*="fight-details"]')
-        fight_url = normalize_ufcstats_url(fight_a.get("href", ""), base_url) if fight_a else ""
+        fight_href = next((href for _, href in links if "fight-details" in href), "")
+        fight_url = normalize_ufcstats_url(fight_href, base_url) if fight_href else ""
         if not fight_url:
             continue
 
@@ -120,13 +173,13 @@ def parse_event_details_html(html: str, base_url: str) -> Tuple[Dict[str, str],
         fighter_1_result = _parse_wl(tds[0])
         fighter_2_result = "loss" if fighter_1_result == "win" else ""
 
-        # Fighters (two anchors inside fighter cell)
-        fighter_links = tds[1].select('a[href*="fighter-details"]')
+        # Fighters (two anchors inside fighter cell; the only fighter links on the row)
+        fighter_links = [a for a, href in links if "fighter-details" in href]
         if len(fighter_links) < 2:
             continue
 
-        fighter_1_name = clean_text(fighter_links[0].get_text(" ", strip=True))
-        fighter_2_name = clean_text(fighter_links[1].get_text(" ", strip=True))
+        fighter_1_name = clean_text(_get_text(fighter_links[0]))
+        fighter_2_name = clean_text(_get_text(fighter_links[1]))
         fighter_1_url = normalize_ufcstats_url(fighter_links[0].get("href", ""), base_url)
         fighter_2_url = normalize_ufcstats_url(fighter_links[1].get("href", ""), base_url)
 
@@ -137,34 +190,34 @@ def parse_event_details_html(html: str, base_url: str) -> Tuple[Dict[str, str],
         sub_1, sub_2 = _two_lines(tds[5])
 
         # fight meta
-        weight_class_raw = clean_text(tds[6].get_text(" ", strip=True))
-        method_raw = clean_text(tds[7].get_text(" ", strip=True))
-        round_raw = clean_text(tds[8].get_text(" ", strip=True))
-        time_raw = clean_text(tds[9].get_text(" ", strip=True))
+        weight_class_raw = intern_text(clean_text(_get_text(tds[6])))
+        method_raw = intern_text(clean_text(_get_text(tds[7])))
+        round_raw = clean_text(_get_text(tds[8]))
+        time_raw = clean_text(_get_text(tds[9]))
 
         fights.append(
-            {
-                "fight_url": fight_url,
-                "fight_order": str(fight_order),
-                "fighter_1_name": fighter_1_name,
-                "fighter_1_url": fighter_1_url,
-                "fighter_1_result": fighter_1_result,
-                "fighter_2_name": fighter_2_name,
-                "fighter_2_url": fighter_2_url,
-                "fighter_2_result": fighter_2_result,
-                "kd_1": kd_1,
-                "str_1": str_1,
-                "td_1": td_1,
-                "sub_1": sub_1,
-                "kd_2": kd_2,
-                "str_2": str_2,
-                "td_2": td_2,
-                "sub_2": sub_2,
-                "weight_class_raw": weight_class_raw,
-                "method_raw": method_raw,
-                "round_raw": round_raw,
-                "time_raw": time_raw,
-            }
+            EventFight(
+                fight_url,
+                str(fight_order),
+                fighter_1_name,
+                fighter_1_url,
+                fighter_1_result,
+                fighter_2_name,
+                fighter_2_url,
+                fighter_2_result,
+                kd_1,
+                str_1,
+                td_1,
+                sub_1,
+                kd_2,
+                str_2,
+                td_2,
+                sub_2,
+                weight_class_raw,
+                method_raw,
+                round_raw,
+                time_raw,
+            )
         )
 
     return event_meta, fights
@@ -1,15 +1,25 @@
 # ufcstats/parse_event_directory.py
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+from lxml.cssselect import CSSSelector
 
-from ufcstats.net import normalize_ufcstats_url
+from ufcstats._text import clean_text
+from ufcstats.net import html_pull_parser, node_text, normalize_ufcstats_url, parse_html
 
+_SEL_EVENTS_TABLE = CSSSelector("table.b-statistics__table-events")
+_SEL_TABLE = CSSSelector("table")
+_SEL_BODY_ROWS = CSSSelector("tbody tr")
+_SEL_CELLS = CSSSelector("td")
+_SEL_EVENT_LINK = CSSSelector('a[href*="event-details"]')
+_SEL_DATE = CSSSelector("span.b-statistics__date")
 
-def clean_text(s: str) -> str:
-    return " ".join((s or "").replace("\xa0", " ").split()).strip()
+EVENT_DIRECTORY_COLUMNS = ("event_url", "event_name", "event_date_raw", "event_location_raw")
+
+_EVENTS_TABLE_CLASS = "b-statistics__table-events"
+# Characters fed to the pull parser per step.
+_STREAM_CHUNK = 1 << 16
 
 
 def parse_event_directory_html(html: str, base_url: str) -> List[Dict[str, str]]:
@@ -25,44 +35,111 @@ def parse_event_directory_html(html: str, base_url: str) -> List[Dict[str, str]]
       - event_date_raw
       - event_location_raw
     """
-    soup = BeautifulSoup(html, "lxml")
-    return parse_event_directory_soup(soup, base_url=base_url)
+    return [dict(zip(EVENT_DIRECTORY_COLUMNS, row)) for row in _stream_event_rows(html, base_url)]
+
+
+def _event_row(tr, base_url: str) -> Optional[Tuple[str, str, str, str]]:
+    """(event_url, event_name, event_date_raw, event_location_raw) for one <tr>, or None."""
+    tds = _SEL_CELLS(tr)
+    if len(tds) < 2:
+        return None
+
+    links = _SEL_EVENT_LINK(tds[0])
+    if not links:
+        return None
+    a = links[0]
+    event_name = clean_text(node_text(a))
+
+    dates = _SEL_DATE(tds[0])
+    event_date_raw = clean_text(node_text(dates[0])) if dates else ""
 
+    event_location_raw = clean_text(node_text(tds[1]))
+    event_url = normalize_ufcstats_url(a.get("href", ""), base=base_url)
 
-def parse_event_directory_soup(soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
+    if not event_url or not event_name:
+        return None
 
-    table = soup.select_one("table.b-statistics__table-events") or soup.select_one("table")
-    if not table:
-        return rows
+    return event_url, event_name, event_date_raw, event_location_raw
 
-    for tr in table.select("tbody tr"):
-        tds = tr.select("td")
-        if len(tds) < 2:
-            continue
 
-        a = tds[0].select_one('a[href*="event-details"]')
-        event_name = clean_text(a.get_text(" ", strip=True)) if a else ""
+def _iter_event_rows(root, base_url: str) -> Iterator[Tuple[str, str, str, str]]:
+    """Yield (event_url, event_name, event_date_raw, event_location_raw) per event row."""
+    tables = _SEL_EVENTS_TABLE(root) or _SEL_TABLE(root)
+    if not tables:
+        return
 
-        date_el = tds[0].select_one("span.b-statistics__date")
-        event_date_raw = clean_text(date_el.get_text(" ", strip=True)) if date_el else ""
+    for tr in _SEL_BODY_ROWS(tables[0]):
+        row = _event_row(tr, base_url)
+        if row is not None:
+            yield row
 
-        event_location_raw = clean_text(tds[1].get_text(" ", strip=True))
-        event_url = normalize_ufcstats_url(a.get("href", ""), base=base_url)
 
-        if not event_url or not event_name:
-            continue
+def _is_events_table(el) -> bool:
+    return _EVENTS_TABLE_CLASS in (el.get("class") or "").split()
 
-        rows.append(
-            {
-                "event_url": event_url,
-                "event_name": event_name,
-                "event_date_raw": event_date_raw,
-                "event_location_raw": event_location_raw,
-            }
-        )
 
-    return rows
+def _stream_event_rows(html: str, base_url: str) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Same rows as _iter_event_rows(parse_html(html)), without keeping the whole
+    tree: `page=all` is one table with the full event history, so each row is
+    read as soon as its </tr> is parsed and then cleared. The caller still
+    holds the full page string; what shrinks is the lxml tree built from it,
+    which never holds more than a few rows at once.
+
+    Pages without the events table (layout change) fall back to the tree
+    parse, which takes the first table instead.
+    """
+    if not (html or "").strip():
+        return
+
+    parser = html_pull_parser("tr")
+    events_table = None
+
+    def drain() -> Iterator[Tuple[str, str, str, str]]:
+        nonlocal events_table
+        for _, tr in parser.read_events():
+            if next(tr.iterancestors("tr"), None) is not None:
+                continue  # nested row; handled (and freed) with its outer row
+
+            # Match "table.b-statistics__table-events tbody tr", first such table only.
+            tbody = next(tr.iterancestors("tbody"), None)
+            table = next((t for t in tbody.iterancestors("table") if _is_events_table(t)), None) if tbody is not None else None
+            if table is not None and events_table is None:
+                events_table = table
+            if table is not None and table is events_table:
+                row = _event_row(tr, base_url)
+                if row is not None:
+                    yield row
+
+            # Free the finished row and any earlier siblings still attached.
+            tr.clear()
+            parent = tr.getparent()
+            if parent is not None:
+                while tr.getprevious() is not None:
+                    del parent[0]
+
+    for start in range(0, len(html), _STREAM_CHUNK):
+        parser.feed(html[start:start + _STREAM_CHUNK])
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+    if events_table is None:
+        yield from _iter_event_rows(parse_html(html), base_url)
+
+
+def parse_event_directory_columns(html: str, base_url: str) -> Dict[str, List[str]]:
+    """
+    Columnar variant of parse_event_directory: one list per column in
+    EVENT_DIRECTORY_COLUMNS order, ready for pd.DataFrame(...) without
+    building a dict per event.
+    """
+    cols: Dict[str, List[str]] = {c: [] for c in EVENT_DIRECTORY_COLUMNS}
+    appends = [cols[c].append for c in EVENT_DIRECTORY_COLUMNS]
+    for row in _stream_event_rows(html, base_url):
+        for append, value in zip(appends, row):
+            append(value)
+    return cols
 
 
 def parse_event_directory(html: str, base_url: str) -> List[Dict[str, str]]:
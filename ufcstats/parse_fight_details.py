@@ -1,21 +1,79 @@
 # ufcstats/parse_fight_details.py
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
+import re
+from typing import Dict
+
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+from ufcstats._text import clean_text
+from ufcstats.net import node_text, parse_html
+
+# Selectors compiled to XPath once at import (el.cssselect() would re-translate them per call).
+_SEL_EVENT_LINK = CSSSelector("h2.b-content__title a.b-link")
+_SEL_PERSONS = CSSSelector("div.b-fight-details__persons div.b-fight-details__person")
+_SEL_PERSON_STATUS = CSSSelector("i.b-fight-details__person-status")
+_SEL_PERSON_LINK = CSSSelector("a.b-fight-details__person-link")
+_SEL_FIGHT_TITLE = CSSSelector("div.b-fight-details__fight-head i.b-fight-details__fight-title")
+_SEL_META_PS = CSSSelector("div.b-fight-details__fight div.b-fight-details__content p.b-fight-details__text")
+_SEL_TOTALS_FALLBACK = CSSSelector("section.b-fight-details__section table[style*='width']")
+_SEL_TABLE = CSSSelector("table")
+_SEL_THEAD = CSSSelector("thead")
+_SEL_BODY_CELLS = CSSSelector("tbody tr td")
+_SEL_TABLE_TEXT = CSSSelector("p.b-fight-details__table-text")
+
+# Only the meta <p>s that can hold a label we read (the Python checks below still apply).
+_XP_META_LABELED_PS = etree.XPath(_SEL_META_PS.path + "[contains(., 'Method:') or contains(., 'Details:')]")
+
+# Labels in the "Method: ... Round: ... Time: ... Time format: ... Referee: ..." line.
+_META_LABEL_RE = re.compile(r"Method:|Round:|Time format:|Time:|Referee:|Details:")
+
+# thead substrings that identify the two tables we read.
+_TOTALS_HEAD = ("Sig. str.", "Total str.", "Sub. att", "Ctrl")
+_SIG_HEAD = ("Head", "Body", "Leg", "Distance", "Clinch", "Ground")
+
+
+def _first(sel: CSSSelector, el):
+    found = sel(el)
+    return found[0] if found else None
 
 
 def _text(el) -> str:
-    if not el:
+    if el is None:
         return ""
-    return " ".join(el.get_text(" ", strip=True).split())
+    return clean_text(node_text(el))
 
 
 def _safe_href(a) -> str:
-    if not a:
+    if a is None:
         return ""
     return a.get("href", "").strip()
 
 
+def _labeled_values(txt: str) -> Dict[str, str]:
+    """
+    {label: value} from one scan of `txt`: each label's first occurrence,
+    up to the next occurrence of a *different* label (stripped).
+    """
+    marks = [(m.group(), m.start(), m.end()) for m in _META_LABEL_RE.finditer(txt)]
+    out: Dict[str, str] = {}
+    for i, (label, _, end) in enumerate(marks):
+        if label in out:
+            continue
+        stop = next((start for other, start, _ in marks[i + 1:] if other != label), len(txt))
+        out[label] = txt[end:stop].strip()
+    return out
+
+
+def _two_lines(td):
+    """(fighter 1, fighter 2) values of a stacked stat cell."""
+    ps = _SEL_TABLE_TEXT(td)
+    v1 = _text(ps[0]) if len(ps) > 0 else ""
+    v2 = _text(ps[1]) if len(ps) > 1 else ""
+    return v1, v2
+
+
 def parse_fight_details(html: str, snapshot: str, fight_url: str) -> dict:
     """
     Parse a UFCStats fight-details page into a single flat row (raw strings).
@@ -23,7 +81,7 @@ def parse_fight_details(html: str, snapshot: str, fight_url: str) -> dict:
     Keeps values mostly as raw strings (e.g., "15 of 27", "55%", "5:47") to
     match your current 'raw' layer philosophy. Staging can normalize later.
     """
-    soup = BeautifulSoup(html, "lxml")
+    root = parse_html(html)
 
     row: dict[str, str] = {
         "snapshot": snapshot,
@@ -78,92 +136,81 @@ def parse_fight_details(html: str, snapshot: str, fight_url: str) -> dict:
     }
 
     # Event title & event URL (top h2 with link to event-details)
-    h2 = soup.select_one("h2.b-content__title a.b-link")
-    if h2:
+    h2 = _first(_SEL_EVENT_LINK, root)
+    if h2 is not None:
         row["event_url"] = _safe_href(h2)
         row["event_name"] = _text(h2)
 
     # Fighter blocks (names/urls/results + nickname on 2nd block sometimes)
-    people = soup.select("div.b-fight-details__persons div.b-fight-details__person")
+    people = _SEL_PERSONS(root)
     if len(people) >= 2:
         p1, p2 = people[0], people[1]
-        row["fighter_1_result"] = _text(p1.select_one("i.b-fight-details__person-status"))
-        a1 = p1.select_one("a.b-fight-details__person-link")
+        row["fighter_1_result"] = _text(_first(_SEL_PERSON_STATUS, p1))
+        a1 = _first(_SEL_PERSON_LINK, p1)
         row["fighter_1_name"] = _text(a1)
         row["fighter_1_url"] = _safe_href(a1)
 
-        row["fighter_2_result"] = _text(p2.select_one("i.b-fight-details__person-status"))
-        a2 = p2.select_one("a.b-fight-details__person-link")
+        row["fighter_2_result"] = _text(_first(_SEL_PERSON_STATUS, p2))
+        a2 = _first(_SEL_PERSON_LINK, p2)
         row["fighter_2_name"] = _text(a2)
         row["fighter_2_url"] = _safe_href(a2)
 
     # Weight class (fight title line)
-    fight_title = soup.select_one("div.b-fight-details__fight-head i.b-fight-details__fight-title")
-    if fight_title:
+    fight_title = _first(_SEL_FIGHT_TITLE, root)
+    if fight_title is not None:
         row["weight_class_raw"] = _text(fight_title).replace("  ", " ").strip()
 
     # Method / round / time / time format / referee
     # They live in: p.b-fight-details__text with labels "Method:", "Round:" ...
-    meta_ps = soup.select("div.b-fight-details__fight div.b-fight-details__content p.b-fight-details__text")
-    for p in meta_ps:
+    for p in _XP_META_LABELED_PS(root):
         txt = _text(p)
         if "Method:" in txt:
             # e.g. "Method: Submission Round: 2 Time: 4:46 Time format: 5 Rnd ... Referee: Herb Dean"
-            # We'll parse by labels conservatively
-            def grab(label: str) -> str:
-                if label not in txt:
-                    return ""
-                after = txt.split(label, 1)[1].strip()
-                # stop at next known label
-                stops = ["Method:", "Round:", "Time:", "Time format:", "Referee:", "Details:"]
-                for s in stops:
-                    if s != label and s in after:
-                        after = after.split(s, 1)[0].strip()
-                return after
-
-            row["method_raw"] = grab("Method:")
-            row["round_raw"] = grab("Round:")
-            row["time_raw"] = grab("Time:")
-            row["time_format_raw"] = grab("Time format:")
-            row["referee_raw"] = grab("Referee:")
+            # Each value runs up to the next known label.
+            vals = _labeled_values(txt)
+            row["method_raw"] = vals.get("Method:", "")
+            row["round_raw"] = vals.get("Round:", "")
+            row["time_raw"] = vals.get("Time:", "")
+            row["time_format_raw"] = vals.get("Time format:", "")
+            row["referee_raw"] = vals.get("Referee:", "")
 
         if "Details:" in txt:
             # Often the last token(s) are the finish detail, but the HTML sometimes has lots of whitespace
             # We'll just take everything after "Details:"
             row["details_raw"] = txt.split("Details:", 1)[1].strip()
 
-    # Totals table: first big table after "Totals"
-    # Header: Fighter, KD, Sig. str., Sig. str. %, Total str., Td, Td %, Sub. att, Rev., Ctrl
-    totals_table = soup.select_one("section.b-fight-details__section table[style*='width']")
-    # The page has multiple tables; the first wide one after Totals is what we want.
-    # We'll instead locate by thead text containing "Sig. str."
-    for tbl in soup.select("table"):
-        head = _text(tbl.select_one("thead"))
-        if "Sig. str." in head and "Total str." in head and "Sub. att" in head and "Ctrl" in head:
+    # One walk over the page's tables, classifying each by its thead text:
+    # - totals: first table whose head has Sig. str. / Total str. / Sub. att / Ctrl
+    #   (Header: Fighter, KD, Sig. str., Sig. str. %, Total str., Td, Td %, Sub. att, Rev., Ctrl)
+    # - sig strikes breakdown: first table whose head has Head/Body/Leg/Distance/Clinch/Ground
+    totals_table = None
+    sig_tbl = None
+    for tbl in _SEL_TABLE(root):
+        head = _text(_first(_SEL_THEAD, tbl))
+        if totals_table is None and all(k in head for k in _TOTALS_HEAD):
             totals_table = tbl
+        if sig_tbl is None and all(k in head for k in _SIG_HEAD):
+            sig_tbl = tbl
+        if totals_table is not None and sig_tbl is not None:
             break
+    if totals_table is None:
+        totals_table = _first(_SEL_TOTALS_FALLBACK, root)
 
-    if totals_table:
+    if totals_table is not None:
         # In tbody, each stat cell has two <p> lines (fighter1 then fighter2)
-        cells = totals_table.select("tbody tr td")
+        cells = _SEL_BODY_CELLS(totals_table)
         # cells[0] is fighter names column (skip)
         # then KD, SigStr, SigStr%, TotalStr, Td, Td%, SubAtt, Rev, Ctrl
         if len(cells) >= 10:
-            def two_lines(td):
-                ps = td.select("p.b-fight-details__table-text")
-                v1 = _text(ps[0]) if len(ps) > 0 else ""
-                v2 = _text(ps[1]) if len(ps) > 1 else ""
-                return v1, v2
-
-            kd1, kd2 = two_lines(cells[1])
-            sig1, sig2 = two_lines(cells[2])
-            sigp1, sigp2 = two_lines(cells[3])
-            tot1, tot2 = two_lines(cells[4])
-            td1, td2 = two_lines(cells[5])
-            tdp1, tdp2 = two_lines(cells[6])
-            sub1, sub2 = two_lines(cells[7])
-            rev1, rev2 = two_lines(cells[8])
-            ctrl1, ctrl2 = two_lines(cells[9])
+            kd1, kd2 = _two_lines(cells[1])
+            sig1, sig2 = _two_lines(cells[2])
+            sigp1, sigp2 = _two_lines(cells[3])
+            tot1, tot2 = _two_lines(cells[4])
+            td1, td2 = _two_lines(cells[5])
+            tdp1, tdp2 = _two_lines(cells[6])
+            sub1, sub2 = _two_lines(cells[7])
+            rev1, rev2 = _two_lines(cells[8])
+            ctrl1, ctrl2 = _two_lines(cells[9])
 
             row.update(
                 {
@@ -189,29 +236,16 @@ def parse_fight_details(html: str, snapshot: str, fight_url: str) -> dict:
             )
 
     # Significant strikes breakdown totals table (Head/Body/Leg/Distance/Clinch/Ground)
-    sig_tables = []
-    for tbl in soup.select("table"):
-        head = _text(tbl.select_one("thead"))
-        if "Head" in head and "Body" in head and "Leg" in head and "Distance" in head and "Clinch" in head and "Ground" in head:
-            sig_tables.append(tbl)
-
-    if sig_tables:
-        sig_tbl = sig_tables[0]
-        cells = sig_tbl.select("tbody tr td")
+    if sig_tbl is not None:
+        cells = _SEL_BODY_CELLS(sig_tbl)
         # columns: Fighter, Sig.str, Sig.str%, Head, Body, Leg, Distance, Clinch, Ground
         if len(cells) >= 9:
-            def two_lines(td):
-                ps = td.select("p.b-fight-details__table-text")
-                v1 = _text(ps[0]) if len(ps) > 0 else ""
-                v2 = _text(ps[1]) if len(ps) > 1 else ""
-                return v1, v2
-
-            head1, head2 = two_lines(cells[3])
-            body1, body2 = two_lines(cells[4])
-            leg1, leg2 = two_lines(cells[5])
-            dist1, dist2 = two_lines(cells[6])
-            clin1, clin2 = two_lines(cells[7])
-            gr1, gr2 = two_lines(cells[8])
+            head1, head2 = _two_lines(cells[3])
+            body1, body2 = _two_lines(cells[4])
+            leg1, leg2 = _two_lines(cells[5])
+            dist1, dist2 = _two_lines(cells[6])
+            clin1, clin2 = _two_lines(cells[7])
+            gr1, gr2 = _two_lines(cells[8])
 
             row.update(
                 {
@@ -2,23 +2,14 @@
 from __future__ import annotations
 
 from typing import Dict
-from bs4 import BeautifulSoup
 
+from lxml.cssselect import CSSSelector
 
-def clean_text(s: str) -> str:
-    return " ".join((s or "").replace("\xa0", " ").split()).strip()
+from ufcstats._text import clean_text
+from ufcstats.net import node_text, parse_html
 
-
-def _extract_labeled_value(soup: BeautifulSoup, label: str) -> str:
-    """
-    On fighter-details pages, left box has rows like:
-      <li class="b-list__box-list-item">DOB: Jul 13, 1978</li>
-    """
-    for li in soup.select("li.b-list__box-list-item"):
-        txt = clean_text(li.get_text(" ", strip=True))
-        if txt.lower().startswith(label.lower() + ":"):
-            return clean_text(txt.split(":", 1)[1])
-    return ""
+# Compiled once at import.
+_SEL_LIST_ITEM = CSSSelector("li.b-list__box-list-item")
 
 
 def parse_fighter_details(html: str) -> Dict[str, str]:
@@ -28,9 +19,7 @@ def parse_fighter_details(html: str) -> Dict[str, str]:
       - career stats: SLpM, Str. Acc., SApM, Str. Def., TD Avg., TD Acc., TD Def., Sub. Avg.
     Returns a single dict (one fighter).
     """
-    soup = BeautifulSoup(html, "lxml")
-
-    dob_raw = _extract_labeled_value(soup, "DOB")
+    root = parse_html(html)
 
     # Career stats live in the middle box; UFCStats uses <li> items:
     # "SLpM: 4.89", "Str. Acc.: 48%", etc.
@@ -45,18 +34,27 @@ def parse_fighter_details(html: str) -> Dict[str, str]:
         "Sub. Avg.": "sub_avg",
     }
 
-    out: Dict[str, str] = {"dob_raw": dob_raw}
+    out: Dict[str, str] = {"dob_raw": ""}
 
     # Initialize empty strings (stable schema)
     for _, key in wanted.items():
         out[key] = ""
 
-    for li in soup.select("li.b-list__box-list-item"):
-        txt = clean_text(li.get_text(" ", strip=True))
-        if ":" not in txt:
+    # One pass over the list items. The left box has rows like
+    #   <li class="b-list__box-list-item">DOB: Jul 13, 1978</li>
+    # (first "DOB:" item wins); a repeated stat label keeps the last value.
+    dob_raw = None
+    for li in _SEL_LIST_ITEM(root):
+        label, sep, value = clean_text(node_text(li)).partition(":")
+        if not sep:
             continue
-        k, v = [clean_text(x) for x in txt.split(":", 1)]
+        value = clean_text(value)
+        if dob_raw is None and label.lower() == "dob":
+            dob_raw = value
+        k = clean_text(label)
         if k in wanted:
-            out[wanted[k]] = v
+            out[wanted[k]] = value
+
+    out["dob_raw"] = dob_raw or ""
 
     return out
@@ -1,14 +1,109 @@
 # ufcstats/parse_fighter_directory.py
 from __future__ import annotations
 
-from typing import Dict, List
-from bs4 import BeautifulSoup
+import html as _html
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from lxml.cssselect import CSSSelector
+
+from ufcstats._text import clean_text, intern_text
+from ufcstats.net import node_text, normalize_ufcstats_url, parse_html
+
+_SEL_STATS_TABLE = CSSSelector("table.b-statistics__table")
+_SEL_TABLE = CSSSelector("table")
+_SEL_BODY_ROWS = CSSSelector("tbody tr")
+_SEL_CELLS = CSSSelector("td")
+_SEL_FIGHTER_LINK = CSSSelector('a[href*="fighter-details"]')
+
+# Regex fast path: the directory is one flat, regular table, so rows/cells can be
+# sliced straight out of the markup without building a tree.
+# Same match as table.b-statistics__table: a whole class token, not e.g. "b-statistics__table-events".
+_STATS_TABLE_RE = re.compile(r'<table\b[^>]*\bclass="(?:[^"]*\s)?b-statistics__table(?=[\s"])[^>]*>', re.I)
+_TABLE_CLOSE_RE = re.compile(r"</table\s*>", re.I)
+_TBODY_RE = re.compile(r"<tbody\b[^>]*>(.*?)</tbody>", re.I | re.S)
+_ROW_RE = re.compile(r"<tr\b[^>]*>(.*?)</tr>", re.I | re.S)
+_CELL_RE = re.compile(r"<td\b[^>]*>(.*?)</td>", re.I | re.S)
+_HREF_RE = re.compile(r"""<a\b[^>]*?\bhref\s*=\s*["']([^"']*fighter-details[^"']*)["']""", re.I)
+# Markup whose text node_text() skips (script/style bodies) or that only separates text (tags, comments).
+_SKIP_RE = re.compile(r"<(script|style)\b.*?</\1\s*>|<!--.*?-->", re.I | re.S)
+_TAG_RE = re.compile(r"<[^>]*>")
+# A table nested inside the data table, or CDATA in it: leave those pages to lxml.
+# Other tables elsewhere on the page don't matter.
+_IRREGULAR_RE = re.compile(r"<table\b|<!\[CDATA\[", re.I)
+
+_MIN_CELLS = 8
+# FIRST | LAST | NICKNAME | HT. | WT. | REACH | STANCE | W | L | D | BELT
+_DIRECTORY_CELLS = 11
+_TR_OPEN_RE = re.compile(r"<tr\b", re.I)
+_TD_OPEN_RE = re.compile(r"<td\b", re.I)
+
+
+def _cell_text(fragment: str) -> str:
+    # Same text node_text() + clean_text() give: tags become separators, entities decoded.
+    return clean_text(_html.unescape(_TAG_RE.sub(" ", _SKIP_RE.sub(" ", fragment))))
+
+
+def _regex_rows(html: str) -> Optional[List[Tuple[List[str], str]]]:
+    """
+    (cell texts, first fighter-details href) per body row of the stats table,
+    or None when the page doesn't look like the plain directory table.
 
-from ufcstats.net import normalize_ufcstats_url
+    All or nothing: if any body row isn't a clean 11-cell row (or the empty
+    spacer row UFCStats puts first), the whole page goes to lxml rather
+    than risking a dropped or shifted row.
+    """
+    table = _STATS_TABLE_RE.search(html)
+    if table is None:
+        return None
+    close = _TABLE_CLOSE_RE.search(html, table.end())
+    if close is None:
+        return None
+    data_table = html[table.end():close.start()]
+    if _IRREGULAR_RE.search(data_table):
+        return None
+    body = _TBODY_RE.search(data_table)
+    if body is None:
+        return None
+
+    tbody = body.group(1)
+    matches = list(_ROW_RE.finditer(tbody))
+    if len(matches) != len(_TR_OPEN_RE.findall(tbody)):
+        return None  # unclosed or nested rows
+
+    rows: List[Tuple[List[str], str]] = []
+    for tr in matches:
+        inner = tr.group(1)
+        cells = _CELL_RE.findall(inner)
+        if len(cells) != len(_TD_OPEN_RE.findall(inner)):
+            return None  # unclosed or nested cells
+        if len(cells) == 1 and not _cell_text(cells[0]):
+            continue  # spacer row
+        if len(cells) != _DIRECTORY_CELLS:
+            return None
+        m = _HREF_RE.search(inner)
+        rows.append(([_cell_text(c) for c in cells], _html.unescape(m.group(1)) if m else ""))
+    return rows
+
+
+def _lxml_rows(html: str) -> Iterator[Tuple[List[str], str]]:
+    root = parse_html(html)
+
+    tables = _SEL_STATS_TABLE(root)
+    if not tables:
+        # fallback to first table if class changes
+        tables = _SEL_TABLE(root)
+    if not tables:
+        return
 
+    for tr in _SEL_BODY_ROWS(tables[0]):
+        tds = _SEL_CELLS(tr)
+        if len(tds) < _MIN_CELLS:
+            continue
 
-def clean_text(s: str) -> str:
-    return " ".join((s or "").replace("\xa0", " ").split()).strip()
+        # Fighter URL: first fighter-details link in the row
+        links = _SEL_FIGHTER_LINK(tr)
+        yield [clean_text(node_text(td)) for td in tds], (links[0].get("href") or "") if links else ""
 
 
 def parse_fighter_directory_html(html: str, base_url: str) -> List[Dict[str, str]]:
@@ -22,76 +117,49 @@ def parse_fighter_directory_html(html: str, base_url: str) -> List[Dict[str, str
     Returns rows with keys:
       fighter_url, fighter_name, first_name, last_name, nickname_raw,
       height_raw, weight_raw, reach_raw, stance_raw, w_raw, l_raw, d_raw, belt_raw
-    """
-    soup = BeautifulSoup(html, "lxml")
-
-    table = soup.select_one("table.b-statistics__table")
-    if not table:
-        # fallback to first table if class changes
-        table = soup.select_one("table")
-    if not table:
-        return []
 
-    rows: List[Dict[str, str]] = []
-
-    for tr in table.select("tbody tr"):
-        tds = tr.select("td")
-        if len(tds) < 8:
-            continue
-
-        # FIRST and LAST are separate columns
-        first_name = clean_text(tds[0].get_text(" ", strip=True))
-        last_name = clean_text(tds[1].get_text(" ", strip=True))
+    Rows come from a regex scan of the table markup; pages it can't handle
+    (no stats table, nested tables, no usable rows) are parsed with lxml.
+    """
+    parsed = _regex_rows(html)
+    if not parsed:
+        parsed = _lxml_rows(html)
 
-        # Fighter URL: first fighter-details link in the row
-        a = tr.select_one('a[href*="fighter-details"]')
-        fighter_url = normalize_ufcstats_url(a["href"], base_url) if a and a.get("href") else ""
+    out: List[Dict[str, str]] = []
+    seen = set()
 
+    for cells, href in parsed:
+        fighter_url = normalize_ufcstats_url(href, base_url) if href else ""
         if not fighter_url:
             continue
 
-        nickname_raw = clean_text(tds[2].get_text(" ", strip=True)) if len(tds) > 2 else ""
-        height_raw = clean_text(tds[3].get_text(" ", strip=True)) if len(tds) > 3 else ""
-        weight_raw = clean_text(tds[4].get_text(" ", strip=True)) if len(tds) > 4 else ""
-        reach_raw = clean_text(tds[5].get_text(" ", strip=True)) if len(tds) > 5 else ""
-        stance_raw = clean_text(tds[6].get_text(" ", strip=True)) if len(tds) > 6 else ""
-
-        # W/L/D/Belt are typically last columns
-        w_raw = clean_text(tds[7].get_text(" ", strip=True)) if len(tds) > 7 else ""
-        l_raw = clean_text(tds[8].get_text(" ", strip=True)) if len(tds) > 8 else ""
-        d_raw = clean_text(tds[9].get_text(" ", strip=True)) if len(tds) > 9 else ""
-        belt_raw = clean_text(tds[10].get_text(" ", strip=True)) if len(tds) > 10 else ""
+        # de-dupe by URL
+        if fighter_url in seen:
+            continue
+        seen.add(fighter_url)
 
-        fighter_name = clean_text(f"{first_name} {last_name}")
+        # FIRST and LAST are separate columns; W/L/D/Belt are typically last columns
+        cells = cells + [""] * (11 - len(cells))
+        first_name, last_name = cells[0], cells[1]
 
-        rows.append(
+        out.append(
             {
                 "fighter_url": fighter_url,
-                "fighter_name": fighter_name,
+                "fighter_name": clean_text(f"{first_name} {last_name}"),
                 "first_name": first_name,
                 "last_name": last_name,
-                "nickname_raw": nickname_raw,
-                "height_raw": height_raw,
-                "weight_raw": weight_raw,
-                "reach_raw": reach_raw,
-                "stance_raw": stance_raw,
-                "w_raw": w_raw,
-                "l_raw": l_raw,
-                "d_raw": d_raw,
-                "belt_raw": belt_raw,
+                "nickname_raw": cells[2],
+                "height_raw": cells[3],
+                "weight_raw": cells[4],
+                "reach_raw": cells[5],
+                "stance_raw": intern_text(cells[6]),
+                "w_raw": cells[7],
+                "l_raw": cells[8],
+                "d_raw": cells[9],
+                "belt_raw": intern_text(cells[10]),
             }
         )
 
-    # de-dupe by URL
-    seen = set()
-    out = []
-    for r in rows:
-        u = r["fighter_url"]
-        if u in seen:
-            continue
-        seen.add(u)
-        out.append(r)
-
     return out
 
 def parse_fighter_directory(html: str, base_url: str) -> List[Dict[str, str]]:
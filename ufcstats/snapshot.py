@@ -1,13 +1,79 @@
 import re
+import os
+import json
+import functools
+import hashlib
+import threading
 import datetime as dt
 from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
 
-DATE_RE = re.compile(r"(20\d{2}-\d{2}-\d{2})")
+# ASCII-only digits; bounded so e.g. "120240-01-01" or "2024-01-011" don't yield a snapshot.
+DATE_RE = re.compile(r"(?<!\d)(20\d{2}-\d{2}-\d{2})(?!\d)", re.ASCII)
 
 def default_snapshot_utc() -> str:
     return dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%d")
 
-def infer_snapshot_from_path(path: str) -> str | None:
+@functools.lru_cache(maxsize=4096)
+def infer_snapshot_from_path(path: Union[str, os.PathLike]) -> str | None:
     name = Path(path).name
     m = DATE_RE.search(name)
     return m.group(1) if m else None
+
+def page_fingerprint(body: bytes) -> str:
+    # BLAKE2b (stdlib): faster than SHA-256, and 128 bits is plenty to spot a changed page.
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+# Modules every parse_* output also depends on (text cleanup, parse_html,
+# node_text, URL normalization); editing any of them invalidates every memo.
+PARSER_SHARED_SOURCES = (
+    Path(__file__).with_name("_text.py"),
+    Path(__file__).with_name("net.py"),
+)
+
+
+class ParseMemo:
+    """
+    url -> (page fingerprint, parsed row) carried across snapshots in one JSON file.
+
+    Most pages are byte-identical to the previous run, so a fingerprint hit
+    returns the earlier parse and the caller skips parse_* entirely.
+    The memo is tied to the source of the parser module and of the shared
+    modules it builds on (PARSER_SHARED_SOURCES): editing any of them (e.g. a
+    selector or clean_text fix) starts an empty memo instead of serving stale rows.
+    """
+
+    def __init__(self, path: Path, parser_file: str, shared_sources: Iterable[Path] = PARSER_SHARED_SOURCES):
+        self.path = Path(path)
+        self._parser = page_fingerprint(
+            b"\0".join(Path(f).read_bytes() for f in (parser_file, *shared_sources))
+        )
+        self._lock = threading.Lock()
+        self._pages: Dict[str, list] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if isinstance(data, dict) and data.get("parser") == self._parser:
+            self._pages = data.get("pages") or {}
+
+    def lookup(self, url: str, fingerprint: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            hit = self._pages.get(url)
+        if hit and hit[0] == fingerprint:
+            return dict(hit[1])
+        return None
+
+    def store(self, url: str, fingerprint: str, row: Dict[str, str]) -> None:
+        with self._lock:
+            self._pages[url] = [fingerprint, row]
+
+    def save(self) -> None:
+        with self._lock:
+            payload = json.dumps({"parser": self._parser, "pages": self._pages})
+        # temp file + rename: an interrupted save leaves the previous memo intact
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)